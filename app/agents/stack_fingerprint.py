@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 import json
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 
@@ -26,26 +27,74 @@ class StackFingerprint:
         return asdict(self)
 
 
-def _read_json(path: str) -> Dict[str, Any]:
+def _read_dep_names(path: str) -> frozenset:
+    """Names from dependencies + devDependencies; the rest of the manifest is dropped."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            pkg = json.load(f)
     except Exception:
-        return {}
+        return frozenset()
+    if not isinstance(pkg, dict):
+        return frozenset()
+    return frozenset(pkg.get("dependencies") or {}) | frozenset(pkg.get("devDependencies") or {})
+
+
+# every path whose contents or mtime can change the fingerprint
+_PROBED_PATHS = (
+    "",
+    "package.json",
+    "backend",
+    os.path.join("backend", "package.json"),
+    "css",
+    "assets",
+    "src",
+)
+
+
+def _probe_mtimes(repo_path: str) -> tuple:
+    out = []
+    for rel in _PROBED_PATHS:
+        try:
+            out.append(os.stat(os.path.join(repo_path, rel)).st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@lru_cache(maxsize=128)
+def _cached_fingerprint(repo_path: str, mtimes: tuple, facts_key: tuple) -> StackFingerprint:
+    return _fingerprint(repo_path, dict(facts_key))
 
 
 def fingerprint_from_repo_facts(repo_path: str, repo_facts: Dict[str, Any]) -> StackFingerprint:
-    pkg_path = os.path.join(repo_path, "package.json")
-    pkg = _read_json(pkg_path) if os.path.exists(pkg_path) else {}
+    """
+    Cached on (repo_path, mtimes of the probed paths, repo_facts) so repeated
+    planner/audit passes over an unchanged repo skip the filesystem entirely.
+    Callers must treat the returned fingerprint as read-only.
+    """
+    try:
+        facts_key = _freeze(repo_facts)
+        hash(facts_key)
+    except TypeError:
+        return _fingerprint(repo_path, repo_facts)
+    return _cached_fingerprint(repo_path, _probe_mtimes(repo_path), facts_key)
+
 
-    deps = {}
-    deps.update(pkg.get("dependencies") or {})
-    deps.update(pkg.get("devDependencies") or {})
+def _fingerprint(repo_path: str, repo_facts: Dict[str, Any]) -> StackFingerprint:
+    dep_names = _read_dep_names(os.path.join(repo_path, "package.json"))
 
-    has_next = "next" in deps or bool(repo_facts.get("has_nextjs"))
-    has_react = "react" in deps or bool(repo_facts.get("has_react"))
-    has_vite = "vite" in deps or bool(repo_facts.get("has_vite"))
-    has_tailwind = "tailwindcss" in deps or bool(repo_facts.get("has_tailwind"))
+    has_next = "next" in dep_names or bool(repo_facts.get("has_nextjs"))
+    has_react = "react" in dep_names or bool(repo_facts.get("has_react"))
+    has_vite = "vite" in dep_names or bool(repo_facts.get("has_vite"))
+    has_tailwind = "tailwindcss" in dep_names or bool(repo_facts.get("has_tailwind"))
 
     # frontend framework/build
     if has_next:
@@ -67,10 +116,7 @@ def fingerprint_from_repo_facts(repo_path: str, repo_facts: Dict[str, Any]) -> S
     backend_framework = "none"
     backend_language = "none"
 
-    backend_pkg = _read_json(os.path.join(repo_path, "backend", "package.json"))
-    backend_deps = {}
-    backend_deps.update(backend_pkg.get("dependencies") or {})
-    backend_deps.update(backend_pkg.get("devDependencies") or {})
+    backend_deps = _read_dep_names(os.path.join(repo_path, "backend", "package.json"))
 
     if os.path.isdir(os.path.join(repo_path, "backend")) and ("express" in backend_deps or os.path.exists(os.path.join(repo_path, "backend", "server.js"))):
         backend_framework = "express"
@@ -1,22 +1,56 @@
 import os
 import subprocess
-from typing import List
+from typing import List, Tuple
 
 
-def run_cmd(cmd: List[str], cwd: str | None = None) -> str:
-    """Run shell command safely and return stdout or raise."""
+def _run(cmd: List[str], cwd: str | None = None, ok: Tuple[int, ...] = (0,)) -> subprocess.CompletedProcess:
+    """Run command with raw byte pipes; stderr is only decoded on failure.
+    Exit codes in `ok` are answers rather than failures (e.g. `git diff --quiet`)."""
     p = subprocess.run(
         cmd,
         cwd=cwd,
-        capture_output=True,
-        text=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         check=False
     )
-    if p.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{p.stderr}")
-    return p.stdout.strip()
+    if p.returncode not in ok:
+        err = p.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{err}")
+    return p
+
+
+def run_cmd(cmd: List[str], cwd: str | None = None) -> str:
+    """Run shell command safely and return stdout or raise."""
+    return _run(cmd, cwd=cwd).stdout.strip().decode("utf-8", errors="replace")
+
+
+def _has_output(cmd: List[str], cwd: str) -> bool:
+    """True once the command prints a single byte; the rest is never read."""
+    p = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        return bool(p.stdout.read(1))
+    finally:
+        p.stdout.close()
+        p.kill()
+        p.wait()
 
 
 def git_has_changes(repo_path: str) -> bool:
-    out = run_cmd(["git", "status", "--porcelain"], cwd=repo_path)
-    return bool(out.strip())
+    """
+    Tracked changes via `git diff --quiet HEAD` (exit code only, git stops at
+    the first difference), then untracked files by reading a single byte of
+    `git ls-files --others` instead of the whole listing. Before the first
+    commit there is no HEAD to diff against, so anything in the index counts.
+    """
+    diff = ["git", "diff", "--quiet", "HEAD"]
+    rc = _run(diff, cwd=repo_path, ok=(0, 1, 128)).returncode
+    if rc == 1:
+        return True
+    if rc == 128:
+        # only a missing HEAD is expected here; otherwise re-run to raise
+        if _run(["git", "rev-parse", "--verify", "-q", "HEAD"], cwd=repo_path, ok=(0, 1)).returncode == 0:
+            _run(diff, cwd=repo_path)
+        if _has_output(["git", "ls-files", "-z"], repo_path):
+            return True
+
+    return _has_output(["git", "ls-files", "--others", "--exclude-standard", "-z"], repo_path)
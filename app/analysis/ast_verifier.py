@@ -14,6 +14,17 @@ class RiskyAttributeVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
+def _index_functions(body: list[ast.stmt]) -> dict[str, ast.FunctionDef]:
+    """Module-level functions and methods; function bodies are not entered."""
+    functions: dict[str, ast.FunctionDef] = {}
+    for node in body:
+        if isinstance(node, ast.FunctionDef):
+            functions[node.name] = node
+        elif isinstance(node, ast.ClassDef):
+            functions.update(_index_functions(node.body))
+    return functions
+
+
 def verify_python_ast(file_content: str, function_name: Optional[str] = None) -> Optional[dict]:
     if not file_content or not isinstance(file_content, str):
         return None
@@ -23,23 +34,20 @@ def verify_python_ast(file_content: str, function_name: Optional[str] = None) ->
     except SyntaxError:
         return None
 
-    functions: dict[str, ast.FunctionDef] = {}
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            functions[node.name] = node
+    functions = _index_functions(tree.body)
+
+    target = functions.get(function_name, tree) if function_name else tree
 
-    target_nodes = [functions[function_name]] if function_name and function_name in functions else [tree]
-
-    risky_attrs: list[dict] = []
-    for node in target_nodes:
-        visitor = RiskyAttributeVisitor()
-        visitor.visit(node)
-        for attr_node in visitor.matches:
-            risky_attrs.append({
-                "lineno": getattr(attr_node, "lineno", None),
-                "col": getattr(attr_node, "col_offset", None),
-                "attr": getattr(attr_node, "attr", None),
-            })
+    visitor = RiskyAttributeVisitor()
+    visitor.visit(target)
+    risky_attrs: list[dict] = [
+        {
+            "lineno": getattr(attr_node, "lineno", None),
+            "col": getattr(attr_node, "col_offset", None),
+            "attr": getattr(attr_node, "attr", None),
+        }
+        for attr_node in visitor.matches
+    ]
 
     if not risky_attrs:
         return None
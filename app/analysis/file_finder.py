@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 
 SKIP_DIRS = {".git", "venv", ".venv", "__pycache__", "node_modules", "dist", "build", "repos"}
+_ASCII_LOWER = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
 
 
 def search_repo(keywords, repo_path, early_stop_hits=3):
@@ -13,6 +14,7 @@ def search_repo(keywords, repo_path, early_stop_hits=3):
     if not keywords:
         return None
 
+    kw_bytes = [kw.encode("utf-8") for kw in keywords]
     candidates = {}
 
     for root, dirs, files in os.walk(repo_path):
@@ -24,11 +26,14 @@ def search_repo(keywords, repo_path, early_stop_hits=3):
 
             path = os.path.join(root, fname)
             try:
-                with open(path, "r", errors="ignore") as f:
-                    text = f.read(3000)
-
-                low = text.lower()
-                hits = sum(1 for kw in keywords if kw in low)
+                # raw bytes are enough for a keyword scan: skip text decoding
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    low = os.read(fd, 3000).translate(_ASCII_LOWER)
+                finally:
+                    os.close(fd)
+
+                hits = sum(1 for kw in kw_bytes if kw in low)
                 if hits:
                     candidates[path] = hits
                     if hits >= early_stop_hits:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import ast
 import difflib
+import re
 
 FORBIDDEN_SUBSTRINGS = [
     "rm -rf",
@@ -11,26 +12,28 @@ FORBIDDEN_SUBSTRINGS = [
     "truncate",
     "chmod 777",
 ]
+_FORBIDDEN_RE = re.compile("|".join(re.escape(s) for s in FORBIDDEN_SUBSTRINGS), re.IGNORECASE)
 
 
 def verify_safe_change(old_content: str, new_content: str, *, max_changed_lines=25) -> tuple[bool, str]:
     if not isinstance(new_content, str) or not new_content.strip():
         return False, "Empty new content"
 
-    lower = new_content.lower()
-    for bad in FORBIDDEN_SUBSTRINGS:
-        if bad in lower:
-            return False, f"Forbidden substring detected: {bad}"
+    m = _FORBIDDEN_RE.search(new_content)
+    if m:
+        return False, f"Forbidden substring detected: {m.group(0).lower()}"
 
+    # new content is the one most likely to be rejected: parse it first so a
+    # broken proposal never pays for parsing the old file
     try:
-        old_ast = ast.parse(old_content)
+        new_ast = ast.parse(new_content)
     except Exception:
-        return False, "Old content failed to parse as Python"
+        return False, "New content failed to parse as Python"
 
     try:
-        new_ast = ast.parse(new_content)
+        old_ast = ast.parse(old_content)
     except Exception:
-        return False, "New content failed to parse as Python"
+        return False, "Old content failed to parse as Python"
 
     if _imports_signature(new_ast) != _imports_signature(old_ast):
         return False, "Imports changed (not allowed)"
@@ -38,12 +41,14 @@ def verify_safe_change(old_content: str, new_content: str, *, max_changed_lines=
     if _top_defs_signature(new_ast) != _top_defs_signature(old_ast):
         return False, "Top-level function/class definitions changed (not allowed)"
 
-    udiff = list(difflib.unified_diff(
-        old_content.splitlines(),
-        new_content.splitlines(),
-        lineterm=""
-    ))
-    changed = sum(1 for line in udiff if line.startswith("+") or line.startswith("-")) - 2
+    changed = sum(
+        1 for line in difflib.unified_diff(
+            old_content.splitlines(),
+            new_content.splitlines(),
+            lineterm=""
+        )
+        if line.startswith("+") or line.startswith("-")
+    ) - 2
     if changed > max_changed_lines:
         return False, f"Too many changed lines ({changed} > {max_changed_lines})"
 
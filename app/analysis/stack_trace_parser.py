@@ -8,23 +8,24 @@ STACK_FRAME_RE = re.compile(
     r"File [\"']([^\"']+)[\"'], line (\d+), in ([\w_]+)"
 )
 
+# library/interpreter frames; one search instead of a lower() and three `in` checks
+_BLACKLIST_RE = re.compile(r"site-packages|lib/python|<string>", re.IGNORECASE)
+
 
 def parse_stack_trace(text: str) -> Optional[Dict]:
     if not text:
         return None
 
-    matches = STACK_FRAME_RE.findall(text)
-    if not matches:
-        return None
-
-    for file, line, func in reversed(matches):
-        if is_user_file(file):
-            return {"file": file, "line": int(line), "function": func}
+    # one forward pass keeping the last user-code frame; no findall list
+    last = None
+    for m in STACK_FRAME_RE.finditer(text):
+        if is_user_file(m.group(1)):
+            last = m
 
-    return None
+    if last is None:
+        return None
+    return {"file": last.group(1), "line": int(last.group(2)), "function": last.group(3)}
 
 
 def is_user_file(file_path: str) -> bool:
-    blacklist = ("site-packages", "lib/python", "<string>")
-    fp = (file_path or "").lower()
-    return fp and not any(b in fp for b in blacklist)
+    return bool(file_path) and _BLACKLIST_RE.search(file_path) is None
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import logging
 import os
 import threading
 import json
+from functools import lru_cache
 from typing import Optional, Any, Dict
 
 from fastapi import FastAPI, Depends, HTTPException
@@ -12,6 +14,7 @@ from fastapi.staticfiles import StaticFiles
 from config import SQLITE_PATH
 from app.storage.artifact_store import ArtifactStore
 from app.dashboard.router import router as dashboard_router
+from app.github.webhook import router as webhook_router
 from app.agents.agent_runner import run_agent_pipeline
 
 # ------------------------------
@@ -34,15 +37,34 @@ app.add_middleware(
 # ------------------------------
 # DB Access
 # ------------------------------
-def get_store() -> ArtifactStore:
-    store = ArtifactStore(SQLITE_PATH)
-    try:
-        store.init_db()
-    except Exception:
-        pass
+@lru_cache(maxsize=1)
+def _bootstrap_store(db_path: str) -> ArtifactStore:
+    # schema + job tables once per process; init_db also fails over
+    # RUNNING jobs, which must not happen on every request
+    store = ArtifactStore(db_path)
+    store.init_db()
+    ensure_job_tables(store)
     return store
 
 
+def get_store() -> ArtifactStore:
+    return _bootstrap_store(SQLITE_PATH)
+
+
+# ------------------------------
+# Job SQL (hoisted so the connection statement cache hits)
+# ------------------------------
+SQL_INSERT_EVENT = "INSERT INTO job_events(job_id, type, payload) VALUES(?, ?, ?)"
+SQL_UPDATE_JOB_TS = "UPDATE agent_jobs SET updated_at=datetime('now') WHERE id=?"
+SQL_SELECT_JOB = "SELECT * FROM agent_jobs WHERE id=?"
+SQL_UPDATE_STATUS = """
+    UPDATE agent_jobs
+    SET status=?, blocked_reason=COALESCE(?, blocked_reason),
+        updated_at=datetime('now')
+    WHERE id=?
+"""
+
+
 # ------------------------------
 # Job tables (additive)
 # ------------------------------
@@ -79,27 +101,22 @@ def ensure_job_tables(store: ArtifactStore) -> None:
             )
             """
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_job_events_jobid_id ON job_events(job_id, id)"
+        )
 
 
 def job_append_event(store: ArtifactStore, job_id: int, typ: str, payload: Any = "") -> None:
     if not isinstance(payload, str):
         payload = json.dumps(payload, ensure_ascii=False)
     with store._conn() as conn:
-        conn.execute(
-            "INSERT INTO job_events(job_id, type, payload) VALUES(?, ?, ?)",
-            (job_id, typ, payload),
-        )
-        conn.execute(
-            "UPDATE agent_jobs SET updated_at=datetime('now') WHERE id=?",
-            (job_id,),
-        )
+        conn.execute(SQL_INSERT_EVENT, (job_id, typ, payload))
+        conn.execute(SQL_UPDATE_JOB_TS, (job_id,))
 
 
 def job_get(store: ArtifactStore, job_id: int) -> Optional[Dict[str, Any]]:
     with store._conn() as conn:
-        row = conn.execute(
-            "SELECT * FROM agent_jobs WHERE id=?", (job_id,)
-        ).fetchone()
+        row = conn.execute(SQL_SELECT_JOB, (job_id,)).fetchone()
     return dict(row) if row else None
 
 
@@ -110,15 +127,7 @@ def job_update_status(
     blocked_reason: Optional[str] = None,
 ) -> None:
     with store._conn() as conn:
-        conn.execute(
-            """
-            UPDATE agent_jobs
-            SET status=?, blocked_reason=COALESCE(?, blocked_reason),
-                updated_at=datetime('now')
-            WHERE id=?
-            """,
-            (status, blocked_reason, job_id),
-        )
+        conn.execute(SQL_UPDATE_STATUS, (status, blocked_reason, job_id))
 
 
 # ------------------------------
@@ -132,10 +141,10 @@ async def root():
 # ------------------------------
 # Job Control Plane
 # ------------------------------
+# Handlers that touch SQLite are plain `def`: FastAPI runs them on its worker
+# threadpool, so a slow write never stalls the event loop for other requests.
 @app.post("/api/jobs")
-async def create_job(payload: Dict[str, Any], store: ArtifactStore = Depends(get_store)):
-    ensure_job_tables(store)
-
+def create_job(payload: Dict[str, Any], store: ArtifactStore = Depends(get_store)):
     owner = (payload.get("owner") or "").strip()
     repo = (payload.get("repo") or "").strip()
     action = (payload.get("action") or "").strip()
@@ -159,8 +168,7 @@ async def create_job(payload: Dict[str, Any], store: ArtifactStore = Depends(get
 
 
 @app.post("/api/jobs/{job_id}/run")
-async def run_job(job_id: int, store: ArtifactStore = Depends(get_store)):
-    ensure_job_tables(store)
+def run_job(job_id: int, store: ArtifactStore = Depends(get_store)):
     job = job_get(store, job_id)
 
     if not job:
@@ -191,8 +199,7 @@ async def run_job(job_id: int, store: ArtifactStore = Depends(get_store)):
 
 
 @app.post("/api/jobs/{job_id}/action")
-async def job_action(job_id: int, payload: Dict[str, Any], store: ArtifactStore = Depends(get_store)):
-    ensure_job_tables(store)
+def job_action(job_id: int, payload: Dict[str, Any], store: ArtifactStore = Depends(get_store)):
     job = job_get(store, job_id)
 
     if not job:
@@ -244,7 +251,7 @@ async def job_action(job_id: int, payload: Dict[str, Any], store: ArtifactStore
 # Detach Repository (FIXED)
 # ------------------------------
 @app.delete("/api/sessions/{session_id}/repos/{repo_id}")
-async def detach_repo(
+def detach_repo(
     session_id: int,
     repo_id: int,
     store: ArtifactStore = Depends(get_store),
@@ -265,10 +272,19 @@ async def detach_repo(
 # ------------------------------
 app.include_router(dashboard_router)
 
+# ------------------------------
+# GitHub Webhooks (ChatOps)
+# ------------------------------
+app.include_router(webhook_router)
+
 if os.path.exists("static"):
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
 @app.on_event("startup")
 async def startup_msg():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    # schema + job tables before the first request; the /dashboard routes
+    # open plain pooled stores and rely on this having run
+    get_store()
     print("\n🎉 API Online → http://localhost:8000\n")
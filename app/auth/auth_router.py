@@ -1,19 +1,24 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from app.auth.auth_service import register_user, login_user
 
 router = APIRouter(prefix="/auth")
 
+# bcrypt hashing is ~100ms+ of CPU per call; run it in a worker thread so
+# concurrent logins don't stall the event loop
+
 @router.post("/register")
-def register(email: str, password: str):
+async def register(email: str, password: str):
     try:
-        register_user(email, password)
+        await asyncio.to_thread(register_user, email, password)
         return {"status": "ok"}
     except ValueError as e:
         raise HTTPException(400, str(e))
 
 @router.post("/login")
-def login(email: str, password: str):
+async def login(email: str, password: str):
     try:
-        return {"token": login_user(email, password)}
+        return {"token": await asyncio.to_thread(login_user, email, password)}
     except ValueError as e:
         raise HTTPException(401, str(e))
@@ -6,6 +6,8 @@ from typing import Optional
 from app.storage.artifact_store import ArtifactStore
 
 COMMAND_PREFIXES = ("/fix", "/retry", "/analysis", "/propose", "/status")
+_VERBS = frozenset(p[1:] for p in COMMAND_PREFIXES)
+_ISSUE_RE = re.compile(r"#?(\d+)")
 
 @dataclass
 class ParsedCommand:
@@ -13,17 +15,20 @@ class ParsedCommand:
     verb: str
     issue_number: Optional[int]
 
-def parse_command(body: str) -> Optional[ParsedCommand]:
+def parse_command(body: str, default_issue: Optional[int] = None) -> Optional[ParsedCommand]:
     body = body.strip()
-    if not body.startswith(COMMAND_PREFIXES):
+    if not body.startswith("/"):
         return None
 
     tokens = body.split()
-    verb = tokens[0].lstrip("/")
-    issue_number = None
+    verb = tokens[0][1:]
+    if verb not in _VERBS:
+        return None
 
+    # a bare `/fix` posted on an issue applies to that issue
+    issue_number = default_issue
     for tok in tokens[1:]:
-        m = re.match(r"#?(\d+)", tok)
+        m = _ISSUE_RE.match(tok)
         if m:
             issue_number = int(m.group(1))
             break
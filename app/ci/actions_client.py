@@ -2,15 +2,39 @@
 from __future__ import annotations
 
 import io
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 
+import orjson
 import requests
 
+from config import GITHUB_META_CACHE_TTL
+from app.github._http import SESSION
+from app.utils.ttl_cache import TTLCache
+
 API = "https://api.github.com"
 
+# (owner, repo) -> default branch
+_default_branch_cache = TTLCache(GITHUB_META_CACHE_TTL)
+
+# log zips up to this size stay in memory, larger ones spill to disk
+LOG_SPOOL_MAX_BYTES = 32 * 1024 * 1024
+_COPY_CHUNK = 64 * 1024
+# zlib releases the GIL while inflating, so threads decode members in parallel
+LOG_DECODE_WORKERS = min(8, os.cpu_count() or 1)
+
+# (url, params) -> (etag, parsed workflow_runs); 304s don't count against the rate limit
+_etag_cache = TTLCache(3600, maxsize=256)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CIRunRef:
     run_id: int
     html_url: str
@@ -19,41 +43,71 @@ class CIRunRef:
     head_sha: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CILogBundle:
     run: CIRunRef
     text: str
     html_url: str
 
 
-def _headers(token: str) -> Dict[str, str]:
-    return {
+@lru_cache(maxsize=4)
+def _headers(token: str) -> Mapping[str, str]:
+    # built once per token; read-only because every request shares it
+    return MappingProxyType({
         "Authorization": f"Bearer {token}",
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28",
         "User-Agent": "AutoTriage-PR-Agent",
-    }
+        "Accept-Encoding": "gzip",
+    })
 
 
-def _safe_get(url: str, token: str, *, params: Optional[dict] = None, timeout: int = 25) -> requests.Response:
-    return requests.get(url, headers=_headers(token), params=params, timeout=timeout)
+def _safe_get(
+    url: str,
+    token: str,
+    *,
+    params: Optional[dict] = None,
+    timeout: int = 25,
+    etag: Optional[str] = None,
+) -> requests.Response:
+    headers = _headers(token)
+    if etag:
+        headers = {**headers, "If-None-Match": etag}
+    return SESSION.get(url, headers=headers, params=params, timeout=timeout)
 
 
 def get_default_branch(owner: str, repo: str, token: str) -> str:
+    key = (owner, repo)
+    cached = _default_branch_cache.get(key)
+    if cached:
+        return cached
+
     url = f"{API}/repos/{owner}/{repo}"
     res = _safe_get(url, token)
     if res.status_code != 200:
         raise RuntimeError(f"Failed to get repo info: {res.status_code}: {res.text}")
     data = res.json()
-    return data.get("default_branch") or "main"
+    branch = data.get("default_branch") or "main"
+    _default_branch_cache.set(key, branch)
+    return branch
 
 
 def _runs(owner: str, repo: str, token: str, *, params: dict) -> Optional[list]:
     url = f"{API}/repos/{owner}/{repo}/actions/runs"
-    res = _safe_get(url, token, params=params)
+    key = (url, tuple(sorted(params.items())))
+    cached = _etag_cache.get(key)
+
+    res = _safe_get(url, token, params=params, etag=cached[0] if cached else None)
+    if res.status_code == 304 and cached:
+        return cached[1]
     if res.status_code != 200:
         return None
-    return (res.json() or {}).get("workflow_runs") or []
+
+    runs = (orjson.loads(res.content) or {}).get("workflow_runs") or []
+    etag = res.headers.get("ETag")
+    if etag:
+        _etag_cache.set(key, (etag, runs))
+    return runs
 
 
 def find_latest_failed_run_on_branch(owner: str, repo: str, token: str, *, branch: str, per_page: int = 30) -> Optional[CIRunRef]:
@@ -97,51 +151,96 @@ def find_latest_failed_run_for_sha(owner: str, repo: str, token: str, *, head_sh
     return None
 
 
-def fetch_run_logs(owner: str, repo: str, token: str, run_id: int) -> Optional[str]:
-    url = f"{API}/repos/{owner}/{repo}/actions/runs/{run_id}/logs"
-    res = _safe_get(url, token, timeout=45)
-    if res.status_code != 200:
-        return None
-
-    # response is a zip; combine *.txt
+def find_failed_runs_by_sha(owner: str, repo: str, token: str, *, per_page: int = 100) -> Dict[str, CIRunRef]:
+    """
+    One /actions/runs?status=failure call for the whole repo, indexed by head_sha.
+    Runs come back newest first, so each SHA maps to its latest failed run.
+    """
+    runs = _runs(owner, repo, token, params={"status": "failure", "per_page": max(1, min(int(per_page), 100))})
+    by_sha: Dict[str, CIRunRef] = {}
+    for r in runs or []:
+        sha = r.get("head_sha") or ""
+        if not sha or sha in by_sha:
+            continue
+        by_sha[sha] = CIRunRef(
+            run_id=int(r["id"]),
+            html_url=r.get("html_url") or "",
+            conclusion=r.get("conclusion") or "failure",
+            created_at=r.get("created_at") or "",
+            head_sha=sha,
+        )
+    return by_sha
+
+
+def _decode_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Optional[str]:
     try:
-        import zipfile
-
-        zdata = io.BytesIO(res.content)
-        with zipfile.ZipFile(zdata) as zf:
-            parts: List[str] = []
-            for name in zf.namelist():
-                if not name.lower().endswith(".txt"):
-                    continue
-                try:
-                    with zf.open(name) as f:
-                        raw = f.read()
-                    text = raw.decode("utf-8", errors="ignore")
-                    parts.append(f"\n\n===== {name} =====\n{text}")
-                except Exception:
-                    continue
-            combined = "\n".join(parts).strip()
-            return combined if combined else None
+        with zf.open(info) as f:
+            return f.read().decode("utf-8", errors="ignore")
     except Exception:
         return None
 
 
-def get_failed_logs_best_effort(owner: str, repo: str, token: str, *, preferred_head_sha: str | None = None) -> Optional[CILogBundle]:
+def fetch_run_logs(owner: str, repo: str, token: str, run_id: int) -> Optional[str]:
+    url = f"{API}/repos/{owner}/{repo}/actions/runs/{run_id}/logs"
+    res = SESSION.get(url, headers=_headers(token), timeout=45, stream=True)
+    with res:
+        if res.status_code != 200:
+            return None
+
+        # response is a zip; combine *.txt
+        # stream it into a spool file and collect members into one buffer
+        # instead of holding the body, a BytesIO copy and a parts list at once
+        try:
+            res.raw.decode_content = True
+            with tempfile.SpooledTemporaryFile(max_size=LOG_SPOOL_MAX_BYTES) as spool:
+                shutil.copyfileobj(res.raw, spool, _COPY_CHUNK)
+                spool.seek(0)
+
+                out = io.StringIO()
+                with zipfile.ZipFile(spool) as zf:
+                    # ZipInfo entries straight from the central directory: open()
+                    # skips the name lookup, and empty members are never inflated
+                    members = [
+                        i for i in zf.infolist()
+                        if i.file_size and not i.is_dir() and i.filename.lower().endswith(".txt")
+                    ]
+                    with ThreadPoolExecutor(max_workers=LOG_DECODE_WORKERS) as pool:
+                        # map() yields in submission order, keeping the output deterministic
+                        texts = pool.map(lambda i: _decode_member(zf, i), members)
+                        for info, text in zip(members, texts):
+                            if text is None:
+                                continue
+                            out.write(f"\n\n===== {info.filename} =====\n")
+                            out.write(text)
+                combined = out.getvalue().strip()
+                return combined if combined else None
+        except Exception:
+            return None
+
+
+def get_failed_logs_best_effort(
+    owner: str,
+    repo: str,
+    token: str,
+    *,
+    preferred_head_sha: str | None = None,
+    known_run: Optional[CIRunRef] = None,
+) -> Optional[CILogBundle]:
     """
     Priority:
+      0) known_run, if the caller already resolved it (see find_failed_runs_by_sha)
       1) If preferred_head_sha provided: latest failed run for that SHA
       2) Else: latest failed run on default branch
     """
-    try:
-        branch = get_default_branch(owner, repo, token)
-    except Exception:
-        branch = "main"
-
-    run = None
-    if preferred_head_sha:
+    run = known_run
+    if not run and preferred_head_sha:
         run = find_latest_failed_run_for_sha(owner, repo, token, head_sha=preferred_head_sha)
 
     if not run:
+        try:
+            branch = get_default_branch(owner, repo, token)
+        except Exception:
+            branch = "main"
         run = find_latest_failed_run_on_branch(owner, repo, token, branch=branch)
 
     if not run:
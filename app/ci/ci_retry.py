@@ -2,18 +2,27 @@ import time
 from app.ci.actions_client import get_failed_logs_best_effort
 from app.ci.test_failure_parser import parse_ci_logs
 
-def wait_for_check_and_fetch(owner, repo, sha, token, timeout=1800, poll=45):
+def wait_for_check_and_fetch(owner, repo, sha, token, timeout=1800, poll=10, max_poll=120):
     """
     Polls GitHub Actions until completion or timeout.
     Returns CI text logs if failed; None if success or timeout.
+    The delay starts at `poll` seconds and doubles up to `max_poll`,
+    resetting whenever the observed run status changes.
     """
     start = time.time()
+    last_status = None
+    attempt = 0
+
+    def backoff():
+        nonlocal attempt
+        time.sleep(min(max_poll, poll * 2 ** attempt))
+        attempt += 1
 
     while time.time() - start < timeout:
         bundle = get_failed_logs_best_effort(owner, repo, token, preferred_head_sha=sha)
 
         if not bundle or not bundle.run:
-            time.sleep(poll)
+            backoff()
             continue
 
         status = bundle.run.conclusion
@@ -25,6 +34,10 @@ def wait_for_check_and_fetch(owner, repo, sha, token, timeout=1800, poll=45):
         if status in {"failure", "timed_out", "cancelled"}:
             return bundle.text
 
-        time.sleep(poll)
+        if status != last_status:
+            attempt = 0
+            last_status = status
+
+        backoff()
 
     return "timeout"
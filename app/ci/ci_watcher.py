@@ -3,9 +3,12 @@ from __future__ import annotations
 
 import sys
 import os
-from typing import Optional, List, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, Optional, List, Tuple
 
-import requests
+import orjson
 
 from app.github.pr_creator import post_ci_retry_status
 from config import (
@@ -28,8 +31,9 @@ from app.analysis.ast_verifier import verify_python_ast
 from app.analysis.safety_verifier import verify_safe_change
 
 # CI integrations
-from app.ci.actions_client import get_failed_logs_best_effort
-from app.ci.test_failure_parser import parse_ci_logs
+from app.github._http import SESSION
+from app.ci.actions_client import find_failed_runs_by_sha, get_failed_logs_best_effort
+from app.ci.test_failure_parser import EMPTY_EVIDENCE, CIParsedEvidence, parse_ci_logs
 from app.ci.retry_engine import classify_ci_outcome, should_retry_from_ci
 
 # Git operations
@@ -39,6 +43,7 @@ from app.git_ops import commit_and_push_amend
 from app.main import _safe_read, _normalize_repo_rel, prepare_repo
 
 from app.utils.sensitive import touches_sensitive_area
+from app.utils.ttl_cache import TTLCache
 
 
 # ----------------------------- GitHub helpers ----------------------------- #
@@ -61,23 +66,127 @@ def _fetch_open_prs(owner: str, repo: str) -> List[dict]:
     headers = {
         "Authorization": f"token {GITHUB_TOKEN}",
         "Accept": "application/vnd.github+json",
+        "Accept-Encoding": "gzip",
     }
     # only open PRs
     params = {"state": "open", "per_page": 50}
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
+    resp = SESSION.get(url, headers=headers, params=params, timeout=30)
     resp.raise_for_status()
-    return resp.json()  # list[dict]
+    return orjson.loads(resp.content)  # list[dict]
+
+
+# Per-PR log lookups are independent round-trips; overlap them
+CI_FETCH_WORKERS = 8
+
+
+def _iter_ci_results(owner: str, repo: str, head_shas: List[str]) -> Iterator[Tuple[str, object, CIParsedEvidence]]:
+    """
+    Yield (head_sha, CILogBundle | None, CIParsedEvidence) in input order.
+
+    Fetching and parsing run ahead in a thread pool, at most CI_FETCH_WORKERS
+    SHAs in flight, so the next PRs' logs download while the caller is busy
+    generating a patch. A single consumer keeps commit order deterministic.
+    Recent failed runs are listed once up front; only SHAs missing from that
+    page fall back to a per-SHA runs query.
+    """
+    if not head_shas:
+        return
+
+    try:
+        by_sha = find_failed_runs_by_sha(owner, repo, GITHUB_TOKEN)
+    except Exception:
+        by_sha = {}
+
+    def fetch(sha: str):
+        bundle = get_failed_logs_best_effort(
+            owner, repo, GITHUB_TOKEN, preferred_head_sha=sha, known_run=by_sha.get(sha)
+        )
+        return bundle, (parse_ci_logs(bundle.text) if bundle else EMPTY_EVIDENCE)
+
+    todo = iter(head_shas)
+    with ThreadPoolExecutor(max_workers=min(CI_FETCH_WORKERS, len(head_shas))) as pool:
+        pending = deque((sha, pool.submit(fetch, sha)) for sha in islice(todo, CI_FETCH_WORKERS))
+        while pending:
+            sha, fut = pending.popleft()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(fetch, nxt)))
+            bundle, evidence = fut.result()
+            yield sha, bundle, evidence
 
 
 # --------------------------- Core CI watcher ------------------------------ #
 
 
-def _pick_failing_file(ci_evidence) -> Optional[str]:
+def _noop(*args, **kwargs):
+    return None
+
+
+class _StoreProxy:
     """
-    Choose the highest-signal failing file from CI evidence.
+    Binds the optional CI hooks of the store once (missing ones become no-ops)
+    and swallows their failures in one place, so the watcher loop doesn't
+    repeat hasattr + try/except around every call.
+    """
+
+    def __init__(self, store) -> None:
+        self._get_retry_status = getattr(store, "get_retry_status", _noop)
+        self._store_retry_status = getattr(store, "store_retry_status", _noop)
+        self._store_ci_evidence = getattr(store, "store_ci_evidence", _noop)
+
+    def previous_attempts(self, owner: str, repo: str, pr_number: int) -> int:
+        try:
+            state = self._get_retry_status(owner, repo, pr_number)
+        except Exception:
+            return 0
+        attempts = getattr(state, "attempts", None) if state else None
+        return attempts if attempts is not None else 0
+
+    def safe_store_retry_status(self, **kwargs) -> bool:
+        try:
+            self._store_retry_status(**kwargs)
+            return True
+        except Exception:
+            return False
+
+    def safe_store_ci_evidence(self, **kwargs) -> bool:
+        try:
+            self._store_ci_evidence(**kwargs)
+            return True
+        except Exception:
+            return False
+
+
+# abs_path -> (st_mtime_ns, st_size, content, line_count); the same failing
+# file tends to be re-read for every poll of an unchanged checkout. Bounded
+# so a long-running watcher doesn't keep every file it ever read.
+_file_cache = TTLCache(600, maxsize=128)
+
+
+def _read_cached(abs_path: str) -> Optional[Tuple[str, int]]:
     """
-    if not ci_evidence or not getattr(ci_evidence, "failing_files_ranked", None):
+    Return (content, line_count) for abs_path, or None if it doesn't exist.
+    Content is reused while the file's mtime and size are unchanged.
+    """
+    try:
+        st = os.stat(abs_path)
+    except OSError:
         return None
+
+    cached = _file_cache.get(abs_path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2], cached[3]
+
+    content = _safe_read(abs_path) or ""
+    line_count = len(content.splitlines())
+    _file_cache.set(abs_path, (st.st_mtime_ns, st.st_size, content, line_count))
+    return content, line_count
+
+
+def _pick_failing_file(ci_evidence: CIParsedEvidence) -> Optional[str]:
+    """
+    Choose the highest-signal failing file from CI evidence.
+    """
     files = ci_evidence.failing_files_ranked
     return files[0] if files else None
 
@@ -90,12 +199,13 @@ def _compute_confidence_for_ci_retry(
     used_rule_based: bool,
     ast_verified: bool,
     safety_verified: bool,
-    ci_evidence,
+    ci_evidence: CIParsedEvidence,
+    file_lines: Optional[int] = None,
 ) -> float:
     """
     Reuse your ConfidenceInputs model for CI retries.
     """
-    used_stack = bool(ci_evidence and getattr(ci_evidence, "has_failure", False))
+    used_stack = ci_evidence.has_failure
     return compute_confidence(
         ConfidenceInputs(
             used_stack_trace=used_stack,
@@ -106,7 +216,7 @@ def _compute_confidence_for_ci_retry(
             safety_verified=safety_verified,
             used_llm=used_llm,
             used_rule_based=used_rule_based,
-            file_lines=len(primary_old.splitlines()),
+            file_lines=file_lines if file_lines is not None else len(primary_old.splitlines()),
         )
     )
 
@@ -132,57 +242,52 @@ def run_ci_watcher(owner: str, repo: str) -> None:
 
     store = ArtifactStore(SQLITE_PATH)
     store.init_db()
+    proxy = _StoreProxy(store)
 
     prs = _fetch_open_prs(owner, repo)
     print(f"🔍 CI watcher: found {len(prs)} open PR(s)")
 
+    # Cheap gating first so only eligible PRs hit the Actions API
+    eligible: List[Tuple[dict, int]] = []
     for pr in prs:
         pr_number = pr.get("number")
         branch = pr.get("head", {}).get("ref")
         head_sha = pr.get("head", {}).get("sha")
 
-        title = pr.get("title") or ""
-        body = pr.get("body") or ""
-
         if not branch or not head_sha:
             print(f"⚠️ PR #{pr_number}: missing head ref/sha – skipping.")
             continue
 
-        print(f"\n━━━━━━━━━ CI WATCHER – PR #{pr_number} ({branch}) ━━━━━━━━━")
-
-        # CI_MODE 1 → only observe, don't patch
-        observe_only = (CI_MODE == 1)
-
         # Lookup previous retry state
-        previous_attempts = 0
-        if hasattr(store, "get_retry_status"):
-            try:
-                retry_state = store.get_retry_status(owner, repo, pr_number)
-                if retry_state and getattr(retry_state, "attempts", None) is not None:
-                    previous_attempts = retry_state.attempts
-            except Exception:
-                previous_attempts = 0
+        previous_attempts = proxy.previous_attempts(owner, repo, pr_number)
 
         # If CI_MODE == 2 and we've already tried once, respect that hard cap
         if CI_MODE == 2 and previous_attempts >= 1:
             print(f"⏭️ PR #{pr_number}: reached CI_MODE=2 retry cap (1 attempt) – skipping.")
             continue
 
-        # Pull CI logs for THIS PR's head SHA
-        ci_bundle = get_failed_logs_best_effort(
-            owner,
-            repo,
-            GITHUB_TOKEN,
-            preferred_head_sha=head_sha,
-        )
+        eligible.append((pr, previous_attempts))
+
+    # CI logs for later PRs are fetched and parsed while earlier ones are patched
+    ci_results = _iter_ci_results(owner, repo, [pr["head"]["sha"] for pr, _ in eligible])
+
+    for (pr, previous_attempts), (_, ci_bundle, ci_evidence) in zip(eligible, ci_results):
+        pr_number = pr.get("number")
+        branch = pr["head"]["ref"]
+
+        title = pr.get("title") or ""
+        body = pr.get("body") or ""
+
+        print(f"\n━━━━━━━━━ CI WATCHER – PR #{pr_number} ({branch}) ━━━━━━━━━")
+
+        # CI_MODE 1 → only observe, don't patch
+        observe_only = (CI_MODE == 1)
 
         if not ci_bundle or not getattr(ci_bundle, "text", None):
             print("🧪 No failed CI logs for this PR – nothing to fix.")
             continue
 
-        ci_evidence = parse_ci_logs(ci_bundle.text)
-
-        if not ci_evidence or not ci_evidence.has_failure:
+        if not ci_evidence.has_failure:
             print("✅ CI logs parsed – no actionable Python failures.")
             continue
 
@@ -193,38 +298,31 @@ def run_ci_watcher(owner: str, repo: str) -> None:
         )
 
         # Persist CI evidence if store supports it
-        if hasattr(store, "store_ci_evidence"):
-            try:
-                store.store_ci_evidence(
-                    owner=owner,
-                    repo=repo,
-                    issue_number=pr_number,
-                    run_id=ci_bundle.run.run_id,
-                    run_url=ci_bundle.html_url,
-                    conclusion=ci_bundle.run.conclusion,
-                    created_at=ci_bundle.run.created_at,
-                    head_sha=ci_bundle.run.head_sha,
-                    failing_files=ci_evidence.failing_files_ranked,
-                    failing_tests=ci_evidence.failing_tests_ranked,
-                    excerpt=ci_evidence.excerpt,
-                )
-            except Exception:
-                print("⚠️ Failed to persist CI evidence (non-fatal).")
+        if not proxy.safe_store_ci_evidence(
+            owner=owner,
+            repo=repo,
+            issue_number=pr_number,
+            run_id=ci_bundle.run.run_id,
+            run_url=ci_bundle.html_url,
+            conclusion=ci_bundle.run.conclusion,
+            created_at=ci_bundle.run.created_at,
+            head_sha=ci_bundle.run.head_sha,
+            failing_files=ci_evidence.failing_files_ranked,
+            failing_tests=ci_evidence.failing_tests_ranked,
+            excerpt=ci_evidence.excerpt,
+        ):
+            print("⚠️ Failed to persist CI evidence (non-fatal).")
 
         # If CI_MODE == 1 we stop here: just observation + logging
         if observe_only:
-            if hasattr(store, "store_retry_status"):
-                try:
-                    store.store_retry_status(
-                        owner=owner,
-                        repo=repo,
-                        issue_number=pr_number,
-                        attempts=previous_attempts,
-                        last_outcome="OBSERVE_ONLY",
-                        active=False,
-                    )
-                except Exception:
-                    pass
+            proxy.safe_store_retry_status(
+                owner=owner,
+                repo=repo,
+                issue_number=pr_number,
+                attempts=previous_attempts,
+                last_outcome="OBSERVE_ONLY",
+                active=False,
+            )
             print("👀 CI_MODE=1: logged evidence only – no patch.")
             continue
 
@@ -234,6 +332,8 @@ def run_ci_watcher(owner: str, repo: str) -> None:
         except Exception:
             ci_outcome = None
 
+        category = getattr(ci_outcome, "category", None) if ci_outcome else None
+
         retry_decision = None
         if ci_outcome is not None:
             try:
@@ -243,23 +343,19 @@ def run_ci_watcher(owner: str, repo: str) -> None:
 
         if not retry_decision or not getattr(retry_decision, "should_retry", False):
             print("⏹ Retry policy says 'no retry' – marking inactive.")
-            if hasattr(store, "store_retry_status"):
-                try:
-                    store.store_retry_status(
-                        owner=owner,
-                        repo=repo,
-                        issue_number=pr_number,
-                        attempts=previous_attempts,
-                        last_outcome=getattr(ci_outcome, "category", None) if ci_outcome else None,
-                        active=False,
-                    )
-                except Exception:
-                    pass
+            proxy.safe_store_retry_status(
+                owner=owner,
+                repo=repo,
+                issue_number=pr_number,
+                attempts=previous_attempts,
+                last_outcome=category,
+                active=False,
+            )
             continue
 
         print(
             f"🔁 Retry allowed by policy (attempt={previous_attempts + 1}) "
-            f"| category={getattr(ci_outcome, 'category', None)}"
+            f"| category={category}"
         )
 
         # ------------------ Decide what to patch ------------------ #
@@ -270,11 +366,12 @@ def run_ci_watcher(owner: str, repo: str) -> None:
             continue
 
         abs_path = os.path.join(repo_path, failing_rel)
-        if not os.path.exists(abs_path):
+        read = _read_cached(abs_path)
+        if read is None:
             print(f"⚠️ CI failing file not found locally: {abs_path}")
             continue
 
-        primary_old = _safe_read(abs_path) or ""
+        primary_old, primary_old_lines = read
         if not primary_old.strip():
             print("⚠️ Target file is empty or unreadable – skipping.")
             continue
@@ -303,18 +400,14 @@ def run_ci_watcher(owner: str, repo: str) -> None:
 
         if not primary_new:
             print("⚠️ CI retry: no new fix produced; marking inactive.")
-            if hasattr(store, "store_retry_status"):
-                try:
-                    store.store_retry_status(
-                        owner=owner,
-                        repo=repo,
-                        issue_number=pr_number,
-                        attempts=previous_attempts,
-                        last_outcome=getattr(ci_outcome, "category", None) if ci_outcome else None,
-                        active=False,
-                    )
-                except Exception:
-                    pass
+            proxy.safe_store_retry_status(
+                owner=owner,
+                repo=repo,
+                issue_number=pr_number,
+                attempts=previous_attempts,
+                last_outcome=category,
+                active=False,
+            )
             continue
 
         # ------------------ Safety gate for CI retries ------------------ #
@@ -338,6 +431,7 @@ def run_ci_watcher(owner: str, repo: str) -> None:
             ast_verified=ast_verified,
             safety_verified=safety_verified,
             ci_evidence=ci_evidence,
+            file_lines=primary_old_lines,
         )
 
         print(
@@ -350,35 +444,27 @@ def run_ci_watcher(owner: str, repo: str) -> None:
         if not safety_verified or confidence < 0.25:
             print("⏹ CI retry blocked: low confidence or safety failure.")
             # Optionally we could store a proposal snapshot here
-            if hasattr(store, "store_retry_status"):
-                try:
-                    store.store_retry_status(
-                        owner=owner,
-                        repo=repo,
-                        issue_number=pr_number,
-                        attempts=previous_attempts,
-                        last_outcome=getattr(ci_outcome, "category", None) if ci_outcome else None,
-                        active=False,
-                    )
-                except Exception:
-                    pass
+            proxy.safe_store_retry_status(
+                owner=owner,
+                repo=repo,
+                issue_number=pr_number,
+                attempts=previous_attempts,
+                last_outcome=category,
+                active=False,
+            )
             continue
 
         # Also block if we are in a clearly sensitive area
         if touches_sensitive_area(abs_path, title, body):
             print("🛑 CI retry blocked: sensitive area detected.")
-            if hasattr(store, "store_retry_status"):
-                try:
-                    store.store_retry_status(
-                        owner=owner,
-                        repo=repo,
-                        issue_number=pr_number,
-                        attempts=previous_attempts,
-                        last_outcome=getattr(ci_outcome, "category", None) if ci_outcome else None,
-                        active=False,
-                    )
-                except Exception:
-                    pass
+            proxy.safe_store_retry_status(
+                owner=owner,
+                repo=repo,
+                issue_number=pr_number,
+                attempts=previous_attempts,
+                last_outcome=category,
+                active=False,
+            )
             continue
 
         # ------------------ Apply patch via amend commit ------------------ #
@@ -401,34 +487,27 @@ def run_ci_watcher(owner: str, repo: str) -> None:
         except Exception as e:
             print(f"❌ Failed to commit CI retry patch: {e}")
             # Mark inactive so we don't loop forever
-            if hasattr(store, "store_retry_status"):
-                try:
-                    store.store_retry_status(
-                        owner=owner,
-                        repo=repo,
-                        issue_number=pr_number,
-                        attempts=previous_attempts,
-                        last_outcome="COMMIT_FAILED",
-                        active=False,
-                    )
-                except Exception:
-                    pass
+            proxy.safe_store_retry_status(
+                owner=owner,
+                repo=repo,
+                issue_number=pr_number,
+                attempts=previous_attempts,
+                last_outcome="COMMIT_FAILED",
+                active=False,
+            )
             continue
 
         # ------------------ Update retry state ------------------ #
 
-        if hasattr(store, "store_retry_status"):
-            try:
-                store.store_retry_status(
-                    owner=owner,
-                    repo=repo,
-                    issue_number=pr_number,
-                    attempts=previous_attempts + 1,
-                    last_outcome=getattr(ci_outcome, "category", None) if ci_outcome else None,
-                    active=True,
-                )
-            except Exception:
-                print("⚠️ Failed to persist retry status after CI retry (non-fatal).")
+        if not proxy.safe_store_retry_status(
+            owner=owner,
+            repo=repo,
+            issue_number=pr_number,
+            attempts=previous_attempts + 1,
+            last_outcome=category,
+            active=True,
+        ):
+            print("⚠️ Failed to persist retry status after CI retry (non-fatal).")
 
         print(
             f"✅ CI retry patch pushed for PR #{pr_number} "
@@ -1,9 +1,12 @@
-import requests
 from typing import Optional
 
+import orjson
+
 from config import GITHUB_TOKEN
 from app.ci.models import CIResult
 from app.ci.log_parser import parse_ci_logs
+from app.github._http import SESSION
+from app.utils.ttl_cache import TTLCache
 
 API = "https://api.github.com"
 
@@ -12,26 +15,37 @@ HEADERS = {
     "Accept": "application/vnd.github+json",
     "X-GitHub-Api-Version": "2022-11-28",
     "User-Agent": "AutoTriage-PR-Agent",
+    "Accept-Encoding": "gzip",
 }
 
+# url -> (etag, parsed workflow_runs)
+_etag_cache = TTLCache(3600, maxsize=64)
+
 
 def fetch_latest_failed_ci(owner: str, repo: str) -> Optional[CIResult]:
     """
     Fetches the most recent FAILED GitHub Actions run (if any).
     """
     runs_url = f"{API}/repos/{owner}/{repo}/actions/runs"
-    res = requests.get(
+    cached = _etag_cache.get(runs_url)
+    headers = {**HEADERS, "If-None-Match": cached[0]} if cached else HEADERS
+    res = SESSION.get(
         runs_url,
-        headers=HEADERS,
+        headers=headers,
         params={"status": "failure", "per_page": 1},
         timeout=20,
     )
 
-    if res.status_code != 200:
+    if res.status_code == 304 and cached:
+        runs = cached[1]
+    elif res.status_code != 200:
         return None
+    else:
+        data = orjson.loads(res.content)
+        runs = data.get("workflow_runs", [])
+        if res.headers.get("ETag"):
+            _etag_cache.set(runs_url, (res.headers["ETag"], runs))
 
-    data = res.json()
-    runs = data.get("workflow_runs", [])
     if not runs:
         return None
 
@@ -39,7 +53,7 @@ def fetch_latest_failed_ci(owner: str, repo: str) -> Optional[CIResult]:
     run_id = run["id"]
 
     logs_url = f"{API}/repos/{owner}/{repo}/actions/runs/{run_id}/logs"
-    logs_res = requests.get(logs_url, headers=HEADERS, timeout=30)
+    logs_res = SESSION.get(logs_url, headers=HEADERS, timeout=30)
 
     if logs_res.status_code != 200:
         return None
@@ -3,34 +3,48 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
 import requests
 
+from config import GITHUB_META_CACHE_TTL
+from app.github._http import SESSION
+from app.utils.ttl_cache import TTLCache
+
 API = "https://api.github.com"
 
-SHA_RE = re.compile(r"\b[a-f0-9]{7,40}\b", re.IGNORECASE)
+# full 40-char SHAs first, then the usual 7-12 char abbreviations
+SHA_RE = re.compile(r"\b[a-f0-9]{40}\b|\b[a-f0-9]{7,12}\b", re.IGNORECASE)
 PR_RE = re.compile(r"(?:#|/pull/)(\d+)\b")
 
+# (owner, repo, pr_number) -> (etag, head sha). The head moves on every push
+# (our own amend/force-push included), so entries are only ever reused after
+# GitHub confirms them with a 304, never served blind.
+_head_sha_cache = TTLCache(GITHUB_META_CACHE_TTL)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IssueCIHint:
     pr_number: Optional[int]
     head_sha: Optional[str]
     reason: str
 
 
-def _headers(token: str) -> dict:
-    return {
+@lru_cache(maxsize=4)
+def _headers(token: str) -> Mapping[str, str]:
+    # built once per token; read-only because every request shares it
+    return MappingProxyType({
         "Authorization": f"Bearer {token}",
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28",
         "User-Agent": "AutoTriage-PR-Agent",
-    }
+    })
 
 
 def _get(url: str, token: str, *, params: dict | None = None, timeout: int = 25) -> requests.Response:
-    return requests.get(url, headers=_headers(token), params=params, timeout=timeout)
+    return SESSION.get(url, headers=_headers(token), params=params, timeout=timeout)
 
 
 def extract_pr_or_sha_from_issue(issue: dict) -> IssueCIHint:
@@ -49,26 +63,42 @@ def extract_pr_or_sha_from_issue(issue: dict) -> IssueCIHint:
         except Exception:
             pr = None
 
-    sha = None
-    # pick the longest sha-like token (often full 40)
-    shas = SHA_RE.findall(text)
-    if shas:
-        sha = max(shas, key=len)
-
     if pr:
         return IssueCIHint(pr_number=pr, head_sha=None, reason=f"Found PR reference #{pr} in issue text.")
+
+    sha = None
+    # pick the longest sha-like token (often full 40); a full sha can't be beaten
+    for m in SHA_RE.finditer(text):
+        s = m.group(0)
+        if sha is None or len(s) > len(sha):
+            sha = s
+            if len(sha) == 40:
+                break
+
     if sha:
         return IssueCIHint(pr_number=None, head_sha=sha, reason=f"Found commit SHA {sha[:10]}… in issue text.")
     return IssueCIHint(pr_number=None, head_sha=None, reason="No PR/SHA found in issue text.")
 
 
 def resolve_head_sha_from_pr(owner: str, repo: str, token: str, pr_number: int) -> Optional[str]:
+    key = (owner, repo, pr_number)
+    cached = _head_sha_cache.get(key)
+    headers = _headers(token)
+    if cached:
+        headers = {**headers, "If-None-Match": cached[0]}
+
     url = f"{API}/repos/{owner}/{repo}/pulls/{pr_number}"
-    res = _get(url, token)
+    res = SESSION.get(url, headers=headers, timeout=25)
+    if res.status_code == 304 and cached:
+        return cached[1]
     if res.status_code != 200:
         return None
     data = res.json() or {}
-    return (data.get("head") or {}).get("sha")
+    sha = (data.get("head") or {}).get("sha")
+    etag = res.headers.get("ETag")
+    if sha and etag:
+        _head_sha_cache.set(key, (etag, sha))
+    return sha
 
 
 def resolve_issue_ci_hint(owner: str, repo: str, token: str, issue: dict) -> IssueCIHint:
@@ -4,15 +4,18 @@ from typing import List
 from app.ci.models import TestFailure
 
 
-PYTEST_FAIL_RE = re.compile(
-    r"_{3,}\s*(.+?)\s*_{3,}.*?E\s+(.*?)(?:\n|$)",
-    re.DOTALL,
-)
-
 PY_TRACE_RE = re.compile(
     r'File "([^"]+)", line (\d+), in ([\w_]+)'
 )
 
+# Single-pass tokenizer over the log: a failure header or an `E   message`
+# line. parse_ci_logs pairs each message with the most recent header, so no
+# pattern ever spans the text between the two.
+_FAILURE_TOKEN_RE = re.compile(
+    r"(?P<header>_{3,}\s*(?P<test>.+?)\s*_{3,})|(?P<error>E\s+(?P<message>.*?)(?:\n|$))",
+    re.DOTALL,
+)
+
 
 def parse_ci_logs(logs: str) -> List[TestFailure]:
     """
@@ -21,17 +24,26 @@ def parse_ci_logs(logs: str) -> List[TestFailure]:
     """
     failures: List[TestFailure] = []
 
-    if not logs:
+    # Every failure needs a `___ name ___` header; skip the tokenizer
+    # entirely on logs without one (lint/import/infra failures).
+    if not logs or "___" not in logs:
         return failures
 
-    for match in PYTEST_FAIL_RE.finditer(logs):
-        test_name = match.group(1).strip()
-        message = match.group(2).strip()
+    header = None
+    for match in _FAILURE_TOKEN_RE.finditer(logs):
+        if match.lastgroup == "header":
+            header = match
+            continue
+        if header is None:
+            continue
+
+        test_name = header.group("test").strip()
+        message = match.group("message").strip()
 
         file = None
         line = None
 
-        trace_match = PY_TRACE_RE.search(message)
+        trace_match = PY_TRACE_RE.search(message) if 'File "' in message else None
         if trace_match:
             file = trace_match.group(1)
             line = int(trace_match.group(2))
@@ -42,8 +54,9 @@ def parse_ci_logs(logs: str) -> List[TestFailure]:
                 file=file,
                 line=line,
                 message=message,
-                raw=match.group(0),
+                raw=logs[header.start():match.end()],
             )
         )
+        header = None
 
     return failures
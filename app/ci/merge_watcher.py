@@ -1,18 +1,38 @@
 import time
-import requests
+from typing import Optional
+from threading import Event
 from config import GITHUB_TOKEN, GITHUB_API
+from app.github._http import SESSION, TIMEOUT
 
-def wait_for_ci_result(owner, repo, sha, timeout=900, interval=20):
+def wait_for_ci_result(owner, repo, sha, timeout=900, interval=10, max_interval=120, stop: Optional[Event] = None):
     """
     Poll GitHub checks API for commit result.
-    timeout=15min default, interval=20s.
+    timeout=15min default; the delay starts at `interval` and doubles up to
+    `max_interval`, resetting whenever the state changes. GitHub's
+    X-Poll-Interval header, when sent, is used as a lower bound.
+    Setting `stop` ends the wait early with "cancelled".
     """
     url = f"{GITHUB_API}/repos/{owner}/{repo}/commits/{sha}/status"
     headers = {"Authorization": f"token {GITHUB_TOKEN}"}
 
+    etag = None
+    last_modified = None
+    r = {}
+    last_state = None
+    attempt = 0
     waited = 0
     while waited < timeout:
-        r = requests.get(url, headers=headers).json()
+        # unchanged status comes back as an empty 304: reuse the last body
+        req_headers = dict(headers)
+        if etag:
+            req_headers["If-None-Match"] = etag
+        if last_modified:
+            req_headers["If-Modified-Since"] = last_modified
+        res = SESSION.get(url, headers=req_headers, timeout=TIMEOUT)
+        if res.status_code != 304:
+            r = res.json()
+            etag = res.headers.get("ETag")
+            last_modified = res.headers.get("Last-Modified") or res.headers.get("Date")
         state = r.get("state")             # success/failure/pending/error
         statuses = r.get("statuses", [])
         desc = statuses[0]["description"] if statuses else "no status"
@@ -22,7 +42,21 @@ def wait_for_ci_result(owner, repo, sha, timeout=900, interval=20):
         if state in ("success", "failure", "error"):
             return state
 
-        time.sleep(interval)
-        waited += interval
+        if state != last_state:
+            attempt = 0
+            last_state = state
+
+        delay = min(max_interval, interval * 2 ** attempt)
+        try:
+            delay = max(delay, int(res.headers.get("X-Poll-Interval") or 0))
+        except ValueError:
+            pass
+        attempt += 1
+
+        if stop is None:
+            time.sleep(delay)
+        elif stop.wait(delay):
+            return "cancelled"
+        waited += delay
 
     return "timeout"
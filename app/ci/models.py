@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TestFailure:
     test_name: Optional[str]
     file: Optional[str]
@@ -12,7 +12,7 @@ class TestFailure:
     raw: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CIResult:
     workflow_name: str
     run_id: int
@@ -9,6 +9,7 @@ Main Job:
  - decide if agent should retry PR
 """
 
+import re
 from dataclasses import dataclass
 from typing import Optional
 
@@ -17,6 +18,23 @@ from typing import Optional
 # CI Outcome Classification
 # ------------------------------
 
+# Both keyword sets in one alternation so the excerpt is scanned once.
+# Any infra keyword wins over a flaky one, wherever it appears.
+_CATEGORY_RE = re.compile(
+    r"(?P<infra>timeout|network|infra|runner|cache fail)|(?P<flaky>flake|flaky|random)",
+    re.IGNORECASE,
+)
+
+
+def _keyword_category(text: str) -> Optional[str]:
+    found = None
+    for m in _CATEGORY_RE.finditer(text):
+        if m.lastgroup == "infra":
+            return "infra"
+        found = "flaky"
+    return found
+
+
 @dataclass
 class CIOutcome:
     category: str          # "infra", "flaky", "legit", "unknown"
@@ -35,19 +53,15 @@ def classify_ci_outcome(ci_evidence) -> CIOutcome:
     tests = ci_evidence.failing_tests_ranked or []
     exc = ci_evidence.excerpt or ""
 
-    msg = exc.lower()
-
     # --- Heuristic classification rules ---
-    if any(x in msg for x in ["timeout", "network", "infra", "runner", "cache fail"]):
-        cat = "infra"
-    elif any(x in msg for x in ["flake", "flaky", "random"]):
-        cat = "flaky"
-    elif len(files) == 0 and len(tests) > 0:
-        cat = "unit_fail"
-    elif len(files) > 0:
-        cat = "legit"
-    else:
-        cat = "unknown"
+    cat = _keyword_category(exc)
+    if cat is None:
+        if len(files) == 0 and len(tests) > 0:
+            cat = "unit_fail"
+        elif len(files) > 0:
+            cat = "legit"
+        else:
+            cat = "unknown"
 
     return CIOutcome(
         category=cat,
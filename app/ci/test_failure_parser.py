@@ -1,9 +1,12 @@
 # app/ci/test_failure_parser.py
 from __future__ import annotations
 
+import hashlib
 import re
+import threading
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 
 PY_FRAME_RE = re.compile(r'File [\'"]([^\'"]+)[\'"], line (\d+), in ([\w_]+)')
@@ -20,8 +23,17 @@ PYTEST_FAILED_LINE_RE = re.compile(
 #   === 2 failed, 10 passed in 3.21s ===
 PYTEST_FOOTER_RE = re.compile(r"=+\s*\d+\s+failed.*=+", re.IGNORECASE)
 
+# ranked lists keep only the most frequent entries
+TOP_N = 10
 
-@dataclass(frozen=True)
+# Logs of a finished run never change, and the watcher re-reads the same run
+# on every poll: remember parsed evidence by a digest of the log text.
+PARSE_CACHE_SIZE = 256
+_parse_cache: "OrderedDict[tuple, CIParsedEvidence]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True, slots=True)
 class CIParsedEvidence:
     has_failure: bool
     failing_files_ranked: List[str]
@@ -32,6 +44,10 @@ class CIParsedEvidence:
     raw_frame_count: int
 
 
+# Shared result for logs with nothing to parse; treat as read-only.
+EMPTY_EVIDENCE = CIParsedEvidence(False, [], None, [], [], "", 0)
+
+
 def _normalize_path(p: str) -> str:
     p = (p or "").strip().replace("\\", "/")
     parts = p.split("/")
@@ -39,30 +55,55 @@ def _normalize_path(p: str) -> str:
 
 
 def parse_ci_logs(log_text: str, *, max_excerpt_chars: int = 2400) -> CIParsedEvidence:
-    if not log_text or not isinstance(log_text, str):
-        return CIParsedEvidence(False, [], None, [], [], "", 0)
-
-    frames = PY_FRAME_RE.findall(log_text)
-    raw_count = len(frames)
-
-    file_hits: Dict[str, int] = {}
-    func_hits: Dict[str, int] = {}
-
-    for file_path, line, func in frames:
+    # whitespace-only logs parse to the empty result too; don't hash them
+    if not log_text or not isinstance(log_text, str) or log_text.isspace():
+        return EMPTY_EVIDENCE
+
+    digest = hashlib.blake2b(log_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    key = (digest, max_excerpt_chars)
+    with _parse_cache_lock:
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+            return cached
+
+    evidence = _parse_ci_logs(log_text, max_excerpt_chars=max_excerpt_chars)
+
+    with _parse_cache_lock:
+        _parse_cache[key] = evidence
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return evidence
+
+
+def _parse_ci_logs(log_text: str, *, max_excerpt_chars: int) -> CIParsedEvidence:
+
+    # Counter.most_common(n) is a partial sort that keeps first-seen order on
+    # ties, same as the stable sorted(..., reverse=True)[:n] it replaces
+    file_hits: Counter = Counter()
+    func_hits: Counter = Counter()
+
+    # one pass over the frames: counts for ranking, plus the last match
+    # for the excerpt fallback below
+    raw_count = 0
+    last_frame = None
+    for last_frame in PY_FRAME_RE.finditer(log_text):
+        raw_count += 1
+        file_path, _line, func = last_frame.groups()
         fp = _normalize_path(file_path)
-        file_hits[fp] = file_hits.get(fp, 0) + 1
+        file_hits[fp] += 1
         if func:
-            func_hits[func] = func_hits.get(func, 0) + 1
+            func_hits[func] += 1
 
-    ranked_files = sorted(file_hits.keys(), key=lambda k: file_hits[k], reverse=True)
+    ranked_files = [k for k, _ in file_hits.most_common(TOP_N)]
 
     failing_func = None
     if func_hits:
-        failing_func = max(func_hits.keys(), key=lambda k: func_hits[k])
+        failing_func = func_hits.most_common(1)[0][0]
 
     # pytest nodeid extraction
-    test_hits: Dict[str, int] = {}
-    test_file_hits: Dict[str, int] = {}
+    test_hits: Counter = Counter()
+    test_file_hits: Counter = Counter()
 
     for m in PYTEST_FAILED_LINE_RE.finditer(log_text):
         test_file = _normalize_path(m.group(1) or "")
@@ -72,11 +113,11 @@ def parse_ci_logs(log_text: str, *, max_excerpt_chars: int = 2400) -> CIParsedEv
         if node_part:
             nodeid = f"{test_file}::{node_part}"
 
-        test_hits[nodeid] = test_hits.get(nodeid, 0) + 1
-        test_file_hits[test_file] = test_file_hits.get(test_file, 0) + 1
+        test_hits[nodeid] += 1
+        test_file_hits[test_file] += 1
 
-    failing_tests_ranked = sorted(test_hits.keys(), key=lambda k: test_hits[k], reverse=True)
-    failing_test_files_ranked = sorted(test_file_hits.keys(), key=lambda k: test_file_hits[k], reverse=True)
+    failing_tests_ranked = [k for k, _ in test_hits.most_common(TOP_N)]
+    failing_test_files_ranked = [k for k, _ in test_file_hits.most_common(TOP_N)]
 
     # excerpt selection: prefer around pytest footer, else around last traceback
     excerpt = ""
@@ -84,15 +125,11 @@ def parse_ci_logs(log_text: str, *, max_excerpt_chars: int = 2400) -> CIParsedEv
     if m:
         start = max(0, m.start() - 1200)
         excerpt = log_text[start:start + max_excerpt_chars]
+    elif last_frame:
+        start = max(0, last_frame.start() - 800)
+        excerpt = log_text[start:start + max_excerpt_chars]
     else:
-        last = None
-        for match in PY_FRAME_RE.finditer(log_text):
-            last = match
-        if last:
-            start = max(0, last.start() - 800)
-            excerpt = log_text[start:start + max_excerpt_chars]
-        else:
-            excerpt = log_text[:max_excerpt_chars]
+        excerpt = log_text[:max_excerpt_chars]
 
     excerpt = excerpt.strip()
 
@@ -100,10 +137,10 @@ def parse_ci_logs(log_text: str, *, max_excerpt_chars: int = 2400) -> CIParsedEv
 
     return CIParsedEvidence(
         has_failure=has_any_failure,
-        failing_files_ranked=ranked_files[:10],
+        failing_files_ranked=ranked_files,
         failing_function=failing_func,
-        failing_tests_ranked=failing_tests_ranked[:10],
-        failing_test_files_ranked=failing_test_files_ranked[:10],
+        failing_tests_ranked=failing_tests_ranked,
+        failing_test_files_ranked=failing_test_files_ranked,
         excerpt=excerpt,
         raw_frame_count=raw_count,
     )
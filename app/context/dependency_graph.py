@@ -2,24 +2,45 @@ import sqlite3
 
 DB_PATH = "app/storage/repo_context.db"
 
+SQL_FILES_CALLING = """
+        SELECT DISTINCT files.path
+        FROM calls
+        JOIN functions ON calls.caller_id = functions.id
+        JOIN files ON functions.file_id = files.id
+        WHERE calls.callee_name = ?
+        """
+
+SQL_COUNT_FILES_CALLING = """
+        SELECT COUNT(DISTINCT files.path)
+        FROM calls
+        JOIN functions ON calls.caller_id = functions.id
+        JOIN files ON functions.file_id = files.id
+        WHERE calls.callee_name = ?
+        """
+
 
 class DependencyGraph:
     def __init__(self):
         self.conn = sqlite3.connect(DB_PATH)
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        try:
+            # without it every lookup scans all of `calls`; caller_id makes it covering for the JOIN
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_callee_caller ON calls(callee_name, caller_id)")
+            self.conn.commit()
+        except sqlite3.OperationalError:
+            pass  # schema not created yet (or read-only db)
 
     def files_calling_function(self, function_name: str) -> list[str]:
-        cur = self.conn.cursor()
-        cur.execute("""
-        SELECT DISTINCT files.path
-        FROM calls
-        JOIN functions ON calls.caller_id = functions.id
-        JOIN files ON functions.file_id = files.id
-        WHERE calls.callee_name = ?
-        """, (function_name,))
+        # same SQL string each call, so sqlite3's statement cache reuses the prepared query
+        cur = self.conn.execute(SQL_FILES_CALLING, (function_name,))
         return [row[0] for row in cur.fetchall()]
 
+    def count_files_calling_function(self, function_name: str) -> int:
+        return self.conn.execute(SQL_COUNT_FILES_CALLING, (function_name,)).fetchone()[0]
+
     def impact_count_for_function(self, function_name: str) -> int:
         """
         How many distinct files call this function (blast radius proxy).
         """
-        return len(self.files_calling_function(function_name))
+        return self.count_files_calling_function(function_name)
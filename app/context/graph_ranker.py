@@ -18,20 +18,7 @@ def dependency_impact(db_path: str, entry_fn: Optional[str]) -> tuple[int, list[
     store = ArtifactStore(db_path)
     store.init_db()
 
-    # We index by repo_root; but here we don't know repo_root.
-    # Practical approach: allow graph_ranker to just use callee_name match across all repo_roots.
-    # Since you run one repo at a time, DB typically contains one repo_root.
-    # We'll query by scanning all repo_root values present.
-    import sqlite3
-    conn = sqlite3.connect(db_path)
-    roots = conn.execute("SELECT DISTINCT repo_root FROM py_calls").fetchall()
-    conn.close()
-
-    impacted_files = set()
-    for (root,) in roots:
-        callers = store.list_callers_of(root, entry_fn)
-        for caller_file, _caller_func in callers:
-            impacted_files.add(caller_file)
-
-    impacted_list = sorted(list(impacted_files))
+    # The DB typically holds one repo_root (one repo at a time), so match
+    # callee_name across all of them in a single query.
+    impacted_list = sorted(store.list_all_callers(entry_fn))
     return len(impacted_list), impacted_list
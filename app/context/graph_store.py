@@ -5,9 +5,11 @@ from contextlib import contextmanager
 from typing import Iterator
 
 
+# Bump when SCHEMA changes; init_db only runs the script for older databases.
+SCHEMA_VERSION = 1
+
 SCHEMA = """
 PRAGMA journal_mode=WAL;
-PRAGMA synchronous=NORMAL;
 
 CREATE TABLE IF NOT EXISTS meta (
   key TEXT PRIMARY KEY,
@@ -52,11 +54,13 @@ CREATE TABLE IF NOT EXISTS edges (
 );
 
 CREATE INDEX IF NOT EXISTS idx_defs_symbol ON defs(symbol);
+CREATE INDEX IF NOT EXISTS idx_defs_symbol_lc ON defs(lower(symbol));
 CREATE INDEX IF NOT EXISTS idx_defs_path ON defs(path);
 CREATE INDEX IF NOT EXISTS idx_imports_path ON imports(path);
 CREATE INDEX IF NOT EXISTS idx_calls_path ON calls(path);
 CREATE INDEX IF NOT EXISTS idx_edges_src ON edges(src_path);
 CREATE INDEX IF NOT EXISTS idx_edges_dst ON edges(dst_path);
+CREATE INDEX IF NOT EXISTS idx_edges_pair ON edges(src_path, dst_path);
 """
 
 
@@ -70,13 +74,22 @@ def connect(db_path: str) -> Iterator[sqlite3.Connection]:
     conn = sqlite3.connect(db_path)
     try:
         conn.execute("PRAGMA foreign_keys=OFF;")
+        # per-connection settings (journal_mode=WAL persists in the file)
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA cache_size=-65536;")
+        conn.execute("PRAGMA mmap_size=268435456;")
         yield conn
     finally:
         conn.close()
 
 
 def init_db(conn: sqlite3.Connection) -> None:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
     conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
     conn.commit()
 
 
@@ -1,9 +1,12 @@
 # app/context/py_indexer.py
 import ast
 import hashlib
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
 
 from app.context.graph_store import (
     connect,
@@ -15,6 +18,28 @@ from app.context.graph_store import (
 
 SKIP_DIRS = {".git", "venv", ".venv", "__pycache__", "node_modules", "dist", "build", ".mypy_cache", ".pytest_cache"}
 
+# ast.parse is CPU-bound and independent per file; below PARALLEL_MIN_FILES
+# changed files the worker start-up costs more than it saves
+INDEX_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_FILES = 16
+
+# One parse pool per process, started on first use. Spawned rather than
+# forked: ensure_index parses while its SQLite handle is open, and the API
+# and watcher run other threads a fork would copy mid-state.
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=INDEX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_pool
+
 
 @dataclass
 class PyFileIndex:
@@ -23,27 +48,43 @@ class PyFileIndex:
     calls: List[Tuple[str, Optional[str], str]]                         # (path, caller, callee)
 
 
-class _CallVisitor(ast.NodeVisitor):
-    def __init__(self):
+class _IndexVisitor(ast.NodeVisitor):
+    """Collects defs, imports and calls for one file in a single traversal."""
+
+    def __init__(self, rel_path: str):
+        self.rel_path = rel_path
+        self.defs = []
+        self.imports = []
         self.calls = []
-        self.current_fn = None
+        self._fn_stack: List[str] = []
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
-        prev = self.current_fn
-        self.current_fn = node.name
+        self.defs.append((node.name, "function", self.rel_path, getattr(node, "lineno", None), getattr(node, "end_lineno", None)))
+        self._fn_stack.append(node.name)
         self.generic_visit(node)
-        self.current_fn = prev
+        self._fn_stack.pop()
 
     def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        prev = self.current_fn
-        self.current_fn = node.name
+        self._fn_stack.append(node.name)
         self.generic_visit(node)
-        self.current_fn = prev
+        self._fn_stack.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.defs.append((node.name, "class", self.rel_path, getattr(node, "lineno", None), getattr(node, "end_lineno", None)))
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.imports.append((self.rel_path, alias.name, "import"))
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        # store module only; it's enough for graph
+        self.imports.append((self.rel_path, node.module or "", "from"))
 
     def visit_Call(self, node: ast.Call):
         name = _callee_name(node.func)
         if name:
-            self.calls.append((self.current_fn, name))
+            self.calls.append((self.rel_path, self._fn_stack[-1] if self._fn_stack else None, name))
         self.generic_visit(node)
 
 
@@ -57,133 +98,143 @@ def _callee_name(func_node) -> Optional[str]:
     return None
 
 
-def _sha1(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+def _content_hash(data: bytes) -> str:
+    # change detection only; stored in the legacy files.sha1 column
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 def _iter_py_files(repo_path: str) -> Iterable[str]:
-    for root, dirs, files in os.walk(repo_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        for f in files:
-            if f.endswith(".py"):
-                yield os.path.join(root, f)
-
-
-def _read_file(path: str) -> str:
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+    # scandir directly: dirent types answer is_dir/is_file without a stat,
+    # and entry.path saves the join. Symlinked dirs aren't descended (as os.walk).
+    stack = [repo_path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    yield entry.path
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
         return f.read()
 
 
-def index_python_file(abs_path: str, rel_path: str) -> Optional[PyFileIndex]:
-    text = _read_file(abs_path)
+def index_python_file(text: str, rel_path: str) -> Optional[PyFileIndex]:
     try:
         tree = ast.parse(text)
     except SyntaxError:
         return None
 
-    defs = []
-    imports = []
-    calls = []
-
-    # defs/imports
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            defs.append((node.name, "function", rel_path, getattr(node, "lineno", None), getattr(node, "end_lineno", None)))
-        elif isinstance(node, ast.ClassDef):
-            defs.append((node.name, "class", rel_path, getattr(node, "lineno", None), getattr(node, "end_lineno", None)))
-        elif isinstance(node, ast.Import):
-            for alias in node.names:
-                imports.append((rel_path, alias.name, "import"))
-        elif isinstance(node, ast.ImportFrom):
-            mod = node.module or ""
-            # store module only; it's enough for graph
-            imports.append((rel_path, mod, "from"))
-
-    # calls (best-effort)
-    v = _CallVisitor()
+    v = _IndexVisitor(rel_path)
     v.visit(tree)
-    for caller, callee in v.calls:
-        calls.append((rel_path, caller, callee))
 
-    return PyFileIndex(defs=defs, imports=imports, calls=calls)
+    return PyFileIndex(defs=v.defs, imports=v.imports, calls=v.calls)
+
+
+def _index_python_files(pairs: List[Tuple[str, str]]) -> List[Optional[PyFileIndex]]:
+    """index_python_file over (text, rel_path) pairs, in order, using a process pool when it pays off."""
+    if INDEX_WORKERS < 2 or len(pairs) < PARALLEL_MIN_FILES:
+        return [index_python_file(text, rel_path) for text, rel_path in pairs]
 
+    texts = [text for text, _ in pairs]
+    rel_paths = [rel_path for _, rel_path in pairs]
+    return list(_get_parse_pool().map(index_python_file, texts, rel_paths, chunksize=8))
 
-def _module_to_file_candidates(repo_path: str, module: str) -> List[str]:
+
+def _module_to_file_candidates(py_files: Set[str], module: str) -> List[str]:
     """
     Very crude: module 'a.b.c' -> a/b/c.py and a/b/c/__init__.py.
-    Returns repo-relative candidates that exist.
+    Returns repo-relative candidates present in py_files (the walked repo).
     """
     if not module:
         return []
     parts = module.split(".")
-    cand1 = os.path.join(*parts) + ".py"
-    cand2 = os.path.join(*parts, "__init__.py")
-    out = []
-    for c in (cand1, cand2):
-        ap = os.path.join(repo_path, c)
-        if os.path.exists(ap):
-            out.append(c.replace("\\", "/"))
-    return out
+    cand1 = "/".join(parts) + ".py"
+    cand2 = "/".join(parts) + "/__init__.py"
+    return [c for c in (cand1, cand2) if c in py_files]
 
 
 def ensure_index(repo_path: str, db_path: str) -> None:
     """
     Incremental index:
-      - For each .py file, compute sha1
-      - If sha1 unchanged, skip
+      - For each .py file, compute a content hash
+      - If hash unchanged, skip
       - Else wipe + reinsert its defs/imports/calls
       - Rebuild import edges for that file
     """
     repo_path = os.path.normpath(repo_path)
 
+    # Rows for every changed file are collected during the walk and written
+    # with one executemany per table, all inside a single transaction.
+    all_defs: List[Tuple[str, str, str, Optional[int], Optional[int]]] = []
+    all_imports: List[Tuple[str, str, str]] = []
+    all_calls: List[Tuple[str, Optional[str], str]] = []
+    all_edges: List[Tuple[str, str, str]] = []
+    changed: List[Tuple[str, str]] = []
+    py_files: Set[str] = set()  # every walked rel_path, for import resolution
+
     with connect(db_path) as conn:
         init_db(conn)
 
         for abs_path in _iter_py_files(repo_path):
             rel_path = os.path.relpath(abs_path, repo_path).replace("\\", "/")
+            py_files.add(rel_path)
             try:
                 mtime = os.path.getmtime(abs_path)
             except OSError:
                 continue
 
-            text = _read_file(abs_path)
-            sha1 = _sha1(text)
+            # one read per file: hash the raw bytes, decode only if it changed
+            try:
+                data = _read_bytes(abs_path)
+            except OSError:
+                continue
+            digest = _content_hash(data)
 
             row = get_file_row(conn, rel_path)
-            if row and row[2] == sha1:
+            if row and row[2] == digest:
                 continue  # unchanged
 
             wipe_file_entries(conn, rel_path)
-            upsert_file(conn, rel_path, "python", sha1, mtime)
+            upsert_file(conn, rel_path, "python", digest, mtime)
+            changed.append((data.decode("utf-8", errors="ignore"), rel_path))
 
-            pf = index_python_file(abs_path, rel_path)
+        # Parse changed files off the writer; SQLite stays single-writer here
+        for (_, rel_path), pf in zip(changed, _index_python_files(changed)):
             if not pf:
-                conn.commit()
                 continue
 
-            conn.executemany(
-                "INSERT INTO defs(symbol, kind, path, line_start, line_end) VALUES (?,?,?,?,?)",
-                pf.defs,
-            )
-            conn.executemany(
-                "INSERT INTO imports(path, imported, kind) VALUES (?,?,?)",
-                pf.imports,
-            )
-            conn.executemany(
-                "INSERT INTO calls(path, caller, callee) VALUES (?,?,?)",
-                pf.calls,
-            )
+            all_defs.extend(pf.defs)
+            all_imports.extend(pf.imports)
+            all_calls.extend(pf.calls)
 
             # Import edges (file-level)
-            edges = []
             for (p, imported, kind) in pf.imports:
-                for dst in _module_to_file_candidates(repo_path, imported):
-                    edges.append((rel_path, dst, "import"))
-
-            if edges:
-                conn.executemany(
-                    "INSERT INTO edges(src_path, dst_path, type) VALUES (?,?,?)",
-                    edges,
-                )
-
-            conn.commit()
+                for dst in _module_to_file_candidates(py_files, imported):
+                    all_edges.append((rel_path, dst, "import"))
+
+        conn.executemany(
+            "INSERT INTO defs(symbol, kind, path, line_start, line_end) VALUES (?,?,?,?,?)",
+            all_defs,
+        )
+        conn.executemany(
+            "INSERT INTO imports(path, imported, kind) VALUES (?,?,?)",
+            all_imports,
+        )
+        conn.executemany(
+            "INSERT INTO calls(path, caller, callee) VALUES (?,?,?)",
+            all_calls,
+        )
+        conn.executemany(
+            "INSERT INTO edges(src_path, dst_path, type) VALUES (?,?,?)",
+            all_edges,
+        )
+
+        conn.commit()
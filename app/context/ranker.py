@@ -20,15 +20,8 @@ class RankedFile:
 def _tokenize(text: str) -> List[str]:
     if not text:
         return []
-    toks = [t.lower() for t in SYMBOL_RE.findall(text)]
-    # de-dup preserving order
-    seen = set()
-    out = []
-    for t in toks:
-        if t not in seen:
-            out.append(t)
-            seen.add(t)
-    return out[:80]
+    # lower once up front; dict.fromkeys de-dups preserving order
+    return list(dict.fromkeys(SYMBOL_RE.findall(text.lower())))[:80]
 
 
 def rank_files(
@@ -84,13 +77,19 @@ def rank_files(
 
         # 3) Symbol hits (defs)
         if issue_tokens:
-            # take most meaningful tokens only
-            for tok in issue_tokens[:40]:
-                cur = conn.execute(
-                    "SELECT path, kind, symbol FROM defs WHERE lower(symbol)=?",
-                    (tok.lower(),),
-                )
-                for p, kind, sym in cur.fetchall():
+            # take most meaningful tokens only; one query for all of them
+            # (served by idx_defs_symbol_lc), bumped back in token order
+            tokens = issue_tokens[:40]
+            placeholders = ",".join("?" * len(tokens))
+            cur = conn.execute(
+                f"SELECT path, kind, symbol FROM defs WHERE lower(symbol) IN ({placeholders})",
+                tokens,
+            )
+            hits: Dict[str, List[Tuple[str, str, str]]] = {}
+            for p, kind, sym in cur.fetchall():
+                hits.setdefault(sym.lower(), []).append((p, kind, sym))
+            for tok in tokens:
+                for p, kind, sym in hits.get(tok, ()):
                     bump(p, 6.0, f"def hit '{sym}' ({kind}) (+6)")
 
         # 4) Keyword hits by partial file read (fast heuristic)
@@ -103,20 +102,23 @@ def rank_files(
             cur = conn.execute("SELECT path FROM files WHERE lang='python' ORDER BY mtime DESC LIMIT 200")
             file_list = [r[0] for r in cur.fetchall()]
 
+        kw_bytes = [k.encode("utf-8") for k in keywords]
+        present = set()  # paths just opened successfully; the final filter needn't stat them
         for p in file_list:
             abs_path = os.path.join(repo_path, p)
-            if not os.path.exists(abs_path):
-                continue
             try:
-                with open(abs_path, "r", encoding="utf-8", errors="ignore") as f:
-                    chunk = f.read(5000).lower()
-            except Exception:
+                # raw bytes are enough for a keyword scan: skip text decoding
+                fd = os.open(abs_path, os.O_RDONLY)
+                try:
+                    chunk = os.read(fd, 5000).lower()
+                finally:
+                    os.close(fd)
+            except OSError:
                 continue
+            present.add(p)
 
-            hit = 0
-            for kw in keywords:
-                if kw and kw in chunk:
-                    hit += 1
+            # substring test per keyword, driven from C; keywords already non-empty
+            hit = sum(map(chunk.__contains__, kw_bytes))
             if hit:
                 bump(p, 2.0 * hit, f"keyword hits x{hit} (+{2.0*hit:.1f})")
 
@@ -124,23 +126,25 @@ def rank_files(
         if candidates:
             best = max(candidates.values(), key=lambda x: x.score).path
 
-            # out-neighbors (imports)
-            cur = conn.execute("SELECT dst_path FROM edges WHERE src_path=?", (best,))
-            for (dst,) in cur.fetchall():
-                bump(dst, 3.0, f"import-neighbor of {best} (+3)")
-
-            # in-neighbors (imported by)
-            cur = conn.execute("SELECT src_path FROM edges WHERE dst_path=?", (best,))
-            for (src,) in cur.fetchall():
-                bump(src, 3.0, f"reverse-import neighbor of {best} (+3)")
+            # out-neighbors (imports), then in-neighbors (imported by), in one
+            # round-trip; both halves are served by the edges indexes
+            cur = conn.execute(
+                "SELECT dst_path, 0 FROM edges WHERE src_path=? "
+                "UNION ALL SELECT src_path, 1 FROM edges WHERE dst_path=?",
+                (best, best),
+            )
+            for other, reverse in cur.fetchall():
+                if reverse:
+                    bump(other, 3.0, f"reverse-import neighbor of {best} (+3)")
+                else:
+                    bump(other, 3.0, f"import-neighbor of {best} (+3)")
 
         ranked = sorted(candidates.values(), key=lambda x: x.score, reverse=True)
 
         # keep only existing files
         out = []
         for r in ranked:
-            abs_path = os.path.join(repo_path, r.path)
-            if os.path.exists(abs_path):
+            if r.path in present or os.path.exists(os.path.join(repo_path, r.path)):
                 out.append(r)
             if len(out) >= top_k:
                 break
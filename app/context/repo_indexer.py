@@ -29,13 +29,24 @@ class RepoIndexer:
         # fresh index
         self.store.clear_repo_graph(self.repo_root)
 
-        for root, dirs, files in os.walk(self.repo_root):
-            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-            for fname in files:
-                if not fname.endswith(".py"):
-                    continue
-                fpath = os.path.join(root, fname)
-                self._index_file(fpath)
+        for fpath in self._iter_py_files():
+            self._index_file(fpath)
+
+    def _iter_py_files(self):
+        # scandir directly: dirent types answer is_dir/is_file without a stat
+        stack = [self.repo_root]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.is_file():
+                        yield entry.path
 
     def _index_file(self, file_path: str) -> None:
         try:
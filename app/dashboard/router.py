@@ -5,35 +5,37 @@ from typing import List, Dict, Any
 
 from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
 from config import SQLITE_PATH
 from app.storage.artifact_store import ArtifactStore
+from app.dashboard.templating import make_templates
 from app.dashboard.routes.jobs import router as jobs_router
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
-templates = Jinja2Templates(directory="templates")
+templates = make_templates("templates")
 
 
 def get_store() -> ArtifactStore:
     return ArtifactStore(SQLITE_PATH)
 
 
+# meta fields the proposal templates read as top-level columns
+PROPOSAL_META_KEYS = ("mode", "confidence", "ci_outcome", "multifile")
+
+
+def _project_meta(proposal: Dict[str, Any]) -> Dict[str, Any]:
+    meta = proposal.get("meta") or {}
+    proposal.update({k: meta.get(k) for k in PROPOSAL_META_KEYS})
+    return proposal
+
+
 @router.get("/proposals", response_class=HTMLResponse)
-async def list_proposals_page(
+def list_proposals_page(
     request: Request,
     store: ArtifactStore = Depends(get_store),
 ):
-    proposals = store.list_proposals(limit=100)
-
-    # Small convenience: unpack some known meta fields
-    for p in proposals:
-        meta = p.get("meta") or {}
-        p["mode"] = meta.get("mode")
-        p["confidence"] = meta.get("confidence")
-        p["ci_outcome"] = meta.get("ci_outcome")
-        p["multifile"] = meta.get("multifile")
+    proposals = [_project_meta(p) for p in store.list_proposals(limit=100)]
 
     return templates.TemplateResponse(
         "dashboard/proposals.html",
@@ -45,7 +47,7 @@ async def list_proposals_page(
 
 
 @router.get("/proposals/{proposal_id}", response_class=HTMLResponse)
-async def proposal_detail_page(
+def proposal_detail_page(
     proposal_id: int,
     request: Request,
     store: ArtifactStore = Depends(get_store),
@@ -56,12 +58,7 @@ async def proposal_detail_page(
 
     proposal, snapshots = result
 
-    # Convenience unpack
-    meta = proposal.get("meta") or {}
-    proposal["mode"] = meta.get("mode")
-    proposal["confidence"] = meta.get("confidence")
-    proposal["ci_outcome"] = meta.get("ci_outcome")
-    proposal["multifile"] = meta.get("multifile")
+    _project_meta(proposal)
 
     return templates.TemplateResponse(
         "dashboard/proposal_detail.html",
@@ -2,23 +2,19 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
 
 from config import SQLITE_PATH
 from app.storage.artifact_store import ArtifactStore
+from app.dashboard.templating import make_templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/dashboard/templates")
+templates = make_templates("app/dashboard/templates")
 
 
 def get_store() -> ArtifactStore:
-    store = ArtifactStore(SQLITE_PATH)
-    try:
-        store.init_db()
-    except Exception:
-        pass
-    return store
+    # schema is created by app.api's startup hook (init_db + job tables); connections come from the pool
+    return ArtifactStore(SQLITE_PATH)
 
 @router.get("/jobs/{job_id}")
 def inspect_job(job_id: int):
@@ -41,7 +37,7 @@ def inspect_job(job_id: int):
     )
 
 @router.get("/dashboard/jobs/{job_id}", response_class=HTMLResponse)
-async def job_detail(
+def job_detail(
     request: Request,
     job_id: int,
     store: ArtifactStore = Depends(get_store),
@@ -65,14 +61,15 @@ async def job_detail(
             (job_id,),
         ).fetchall()
 
-    # Convert rows to dicts
-    job = dict(job)
-    events = [dict(e) for e in events]
+    # job and events stay sqlite3.Row: Jinja's `job.status` falls back to
+    # row["status"], so there is no need for a dict copy per row
 
-    # Extract DIFF event if present
+    # Extract the latest DIFF event if present: walk back from the newest
+    # event and parse only that one payload
     diff_event = None
-    for e in events:
+    for e in reversed(events):
         if e["type"] == "DIFF":
+            e = dict(e)
             try:
                 diff_event = {
                     "meta": e,
@@ -83,6 +80,7 @@ async def job_detail(
                     "meta": e,
                     "data": {"diff": e["payload"]},
                 }
+            break
 
     return templates.TemplateResponse(
         "job_detail.html",
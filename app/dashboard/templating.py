@@ -0,0 +1,26 @@
+# app/dashboard/templating.py
+from __future__ import annotations
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from config import TEMPLATE_AUTO_RELOAD
+
+# compiled template bytecode survives restarts (stored in the system temp dir)
+_bytecode_cache = FileSystemBytecodeCache()
+
+
+def make_templates(directory: str) -> Jinja2Templates:
+    """
+    Jinja2Templates over an explicit Environment: compiled templates stay
+    cached in memory without a per-render mtime check, and bytecode is
+    shared across processes.
+    """
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        autoescape=True,
+        auto_reload=TEMPLATE_AUTO_RELOAD,
+        cache_size=400,
+        bytecode_cache=_bytecode_cache,
+    )
+    return Jinja2Templates(env=env)
@@ -2,9 +2,8 @@
 from __future__ import annotations
 
 import sqlite3
-import time
 from functools import wraps
-from threading import Thread
+from threading import Event, Thread
 
 from flask import (
     Flask, render_template, request,
@@ -33,7 +32,12 @@ AGENT_ACTIONS = [
     ("create_pr", "Create PR"),
 ]
 
-AGENT_ACTION_KEYS = {a[0] for a in AGENT_ACTIONS}
+AGENT_ACTION_KEYS = frozenset(a[0] for a in AGENT_ACTIONS)
+
+# Set whenever this process enqueues a job so the worker picks it up at once;
+# the timeout still catches jobs queued by other processes (e.g. the API).
+_job_wakeup = Event()
+WORKER_IDLE_TIMEOUT = 5.0
 
 # ----------------- Auth -----------------
 
@@ -128,11 +132,12 @@ def create_session():
 @app.route("/session/<int:sid>")
 @login_required
 def session_view(sid):
+    session_obj, repos, jobs = store.get_session_bundle(sid)
     return render_template(
         "dashboard/session.html",
-        session_obj=store.get_session(sid),
-        repos=store.get_repos_for_session(sid),
-        jobs=store.get_agent_jobs_for_session(sid),
+        session_obj=session_obj,
+        repos=repos,
+        jobs=jobs,
         actions=AGENT_ACTIONS,
     )
 
@@ -156,24 +161,22 @@ def attach_repo(sid):
 @app.route("/session/<int:sid>/run", methods=["POST"])
 @login_required
 def run_session(sid):
-    repos = store.get_repos_for_session(sid)
-    if not repos:
-        flash("Attach a repository first", "error")
+    # reject a bad action before touching the DB
+    action = (request.form.get("action") or "").strip()
+    if action not in AGENT_ACTION_KEYS:
+        flash(f"Invalid action: {action}", "error")
         return redirect(url_for("session_view", sid=sid))
 
-    repo_id = request.form.get("repo_id")
-    repo = next((r for r in repos if str(r["id"]) == str(repo_id)), None)
+    repo = store.get_session_repo(sid, request.form.get("repo_id", type=int))
     if not repo:
-        flash("Invalid repo", "error")
+        if not store.get_repos_for_session(sid):
+            flash("Attach a repository first", "error")
+        else:
+            flash("Invalid repo", "error")
         return redirect(url_for("session_view", sid=sid))
 
-    action = (request.form.get("action") or "").strip()
     prompt = (request.form.get("prompt") or "").strip()
 
-    if action not in AGENT_ACTION_KEYS:
-        flash(f"Invalid action: {action}", "error")
-        return redirect(url_for("session_view", sid=sid))
-
     job_id = store.enqueue_agent_job(
         session_id=sid,
         owner=repo["owner"],
@@ -187,6 +190,7 @@ def run_session(sid):
         "SERVER_ENQUEUED",
         f"{repo['owner']}/{repo['repo']} :: {action}",
     )
+    _job_wakeup.set()
 
     flash(f"Job #{job_id} queued ({action})", "success")
     return redirect(url_for("session_view", sid=sid))
@@ -227,6 +231,7 @@ def job_action(job_id):
             job["action"],
             job["prompt"],
         )
+        _job_wakeup.set()
     else:
         return jsonify({"error": "invalid action"}), 400
 
@@ -238,7 +243,8 @@ def job_worker():
     while True:
         job = store.fetch_next_agent_job()
         if not job:
-            time.sleep(1)
+            _job_wakeup.wait(WORKER_IDLE_TIMEOUT)
+            _job_wakeup.clear()
             continue
 
         jid = job["id"]
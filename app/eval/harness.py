@@ -1,15 +1,25 @@
 # app/eval/harness.py
 from __future__ import annotations
 
+import os
 import subprocess
 import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 from app.storage.artifact_store import ArtifactStore
 from config import SQLITE_PATH
 
+# each scenario is its own `python -m app.main` process; keep a few in flight
+# but not so many that their SQLite writers pile up on the WAL lock
+EVAL_WORKERS = min(4, os.cpu_count() or 1)
+
+# libyaml's loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class ScenarioResult:
@@ -29,27 +39,50 @@ def run_scenario(owner: str, repo: str, issue_number: int) -> None:
     subprocess.run(cmd, check=False)
 
 
-def evaluate_scenarios(config_path: str) -> List[ScenarioResult]:
+@lru_cache(maxsize=8)
+def _parse_scenarios(config_path: str, mtime_ns: int) -> List[Dict[str, Any]]:
+    # mtime_ns is only part of the cache key: editing the file invalidates it
     with open(config_path, "r", encoding="utf-8") as f:
-        scenarios = yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+def load_scenarios(config_path: str) -> List[Dict[str, Any]]:
+    return _parse_scenarios(config_path, os.stat(config_path).st_mtime_ns)
+
+
+def evaluate_scenarios(config_path: str) -> List[ScenarioResult]:
+    scenarios = load_scenarios(config_path)
 
     store = ArtifactStore(SQLITE_PATH)
     store.init_db()
 
     results: List[ScenarioResult] = []
 
+    # app.main takes OWNER/REPO only, so scenarios on the same repo share one run;
+    # distinct repos have no data dependency and run side by side
+    repos: Dict[Tuple[str, str], int] = {}
+    for sc in scenarios:
+        repos.setdefault((sc["owner"], sc["repo"]), int(sc["issue"]))
+    elapsed_by_repo: Dict[Tuple[str, str], float] = {}
+
+    def _timed_run(key: Tuple[str, str]) -> float:
+        print(f"\n▶ Running {key[0]}/{key[1]}")
+        before = time.time()
+        run_scenario(key[0], key[1], repos[key])
+        return time.time() - before
+
+    if repos:
+        with ThreadPoolExecutor(max_workers=min(len(repos), EVAL_WORKERS)) as pool:
+            for key, elapsed in zip(repos, pool.map(_timed_run, repos)):
+                elapsed_by_repo[key] = elapsed
+
     for sc in scenarios:
         sc_id = sc["id"]
         owner = sc["owner"]
         repo = sc["repo"]
         issue_number = int(sc["issue"])
         expected_status = sc.get("expected_status", "PR_CREATED")
-
-        print(f"\n▶ Running scenario {sc_id} (#{issue_number})")
-        before = time.time()
-        run_scenario(owner, repo, issue_number)
-        after = time.time()
-        elapsed = after - before
+        elapsed = elapsed_by_repo[(owner, repo)]
 
         runs = store.get_runs_for_issue(owner, repo, issue_number)
         if not runs:
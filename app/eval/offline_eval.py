@@ -7,8 +7,9 @@ import json
 import sqlite3
 import sys
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 # -----------------------------
@@ -22,7 +23,15 @@ class RunRecord:
     issue_number: int
     confidence: float
     decision: str
-    meta: dict
+    meta_json: Optional[str] = None
+
+    @cached_property
+    def meta(self) -> dict:
+        # decoded on first access only; the histograms never look at it
+        try:
+            return json.loads(self.meta_json) if self.meta_json else {}
+        except Exception:
+            return {}
 
 
 @dataclass
@@ -53,9 +62,12 @@ class EvalResult:
 # Loading from SQLite
 # -----------------------------
 
-def load_runs(db_path: Path) -> List[RunRecord]:
+FETCH_BATCH = 1000
+
+
+def load_runs(db_path: Path) -> Iterator[RunRecord]:
     """
-    Load agent_runs from the SQLite DB.
+    Stream agent_runs from the SQLite DB, newest first.
 
     Expected schema (what ArtifactStore.store_run writes):
       agent_runs(
@@ -72,10 +84,14 @@ def load_runs(db_path: Path) -> List[RunRecord]:
     """
     if not db_path.exists():
         raise FileNotFoundError(f"SQLite db not found at {db_path}")
+    return _iter_runs(db_path)
+
 
+def _iter_runs(db_path: Path) -> Iterator[RunRecord]:
     conn = sqlite3.connect(str(db_path))
     try:
         cur = conn.cursor()
+        cur.arraysize = FETCH_BATCH
         cur.execute(
             """
             SELECT owner, repo, issue_number, confidence, decision, meta_json
@@ -83,29 +99,19 @@ def load_runs(db_path: Path) -> List[RunRecord]:
             ORDER BY created_at DESC
             """
         )
-        rows = cur.fetchall()
+        while rows := cur.fetchmany():
+            for owner, repo, issue, conf, decision, meta_json in rows:
+                yield RunRecord(
+                    owner=owner,
+                    repo=repo,
+                    issue_number=int(issue),
+                    confidence=float(conf or 0.0),
+                    decision=decision or "UNKNOWN",
+                    meta_json=meta_json,
+                )
     finally:
         conn.close()
 
-    runs: List[RunRecord] = []
-    for owner, repo, issue, conf, decision, meta_json in rows:
-        try:
-            meta = json.loads(meta_json) if meta_json else {}
-        except Exception:
-            meta = {}
-
-        runs.append(
-            RunRecord(
-                owner=owner,
-                repo=repo,
-                issue_number=int(issue),
-                confidence=float(conf or 0.0),
-                decision=decision or "UNKNOWN",
-                meta=meta,
-            )
-        )
-    return runs
-
 
 # -----------------------------
 # Ground truth CSV loader
@@ -176,14 +182,111 @@ def _bucket_for_conf(conf: float) -> str:
     return "[0.9, 1.0]"
 
 
+# same edges as _bucket_for_conf, so SQLite can group rows without a Python
+# round-trip per run
+SQL_RUN_HISTOGRAM = """
+    SELECT
+        COALESCE(NULLIF(decision, ''), 'UNKNOWN') AS dec,
+        CASE
+            WHEN COALESCE(confidence, 0.0) < 0.2 THEN '[0.0, 0.2)'
+            WHEN COALESCE(confidence, 0.0) < 0.4 THEN '[0.2, 0.4)'
+            WHEN COALESCE(confidence, 0.0) < 0.6 THEN '[0.4, 0.6)'
+            WHEN COALESCE(confidence, 0.0) < 0.8 THEN '[0.6, 0.8)'
+            WHEN COALESCE(confidence, 0.0) < 0.9 THEN '[0.8, 0.9)'
+            ELSE '[0.9, 1.0]'
+        END AS bucket,
+        COUNT(*)
+    FROM agent_runs
+    GROUP BY dec, bucket
+"""
+
+SQL_CREATE_GT = """
+    CREATE TEMP TABLE gt (
+        owner TEXT,
+        repo TEXT,
+        issue_number INTEGER,
+        expected TEXT,
+        accepted INTEGER,
+        PRIMARY KEY (owner, repo, issue_number)
+    )
+"""
+
+SQL_INSERT_GT = "INSERT OR REPLACE INTO gt VALUES (?, ?, ?, ?, ?)"
+
+# confusion counts for the two auto decisions, joined against the labels in C
+SQL_DECISION_ACCURACY = """
+    SELECT r.decision, SUM(r.decision = gt.expected), COUNT(*)
+    FROM agent_runs AS r
+    JOIN gt ON gt.owner = r.owner
+           AND gt.repo = r.repo
+           AND gt.issue_number = r.issue_number
+    WHERE r.decision IN ('APPLY', 'PROPOSE')
+    GROUP BY r.decision
+"""
+
+
+def _ratio(correct: int, total: int) -> Optional[float]:
+    return correct / total if total > 0 else None
+
+
+def evaluate_db(
+    db_path: Path,
+    truth_map: Optional[Dict[Tuple[str, str, int], GroundTruth]] = None,
+) -> EvalResult:
+    """
+    Same result as evaluate_runs(load_runs(db_path), truth_map), but the
+    counting is done by SQLite: GROUP BY for the histograms and a join
+    against a temp table of the labels for accuracy.
+    """
+    if not db_path.exists():
+        raise FileNotFoundError(f"SQLite db not found at {db_path}")
+
+    by_decision: Dict[str, int] = {}
+    by_bucket: Dict[str, int] = {}
+    total_runs = 0
+
+    # (correct, total) per decision
+    hits = {"APPLY": [0, 0], "PROPOSE": [0, 0]}
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        for dec, bucket, n in conn.execute(SQL_RUN_HISTOGRAM):
+            total_runs += n
+            by_decision[dec] = by_decision.get(dec, 0) + n
+            by_bucket[bucket] = by_bucket.get(bucket, 0) + n
+
+        if truth_map:
+            conn.execute(SQL_CREATE_GT)
+            conn.executemany(
+                SQL_INSERT_GT,
+                (
+                    (gt.owner, gt.repo, gt.issue_number,
+                     gt.expected_decision.upper(), gt.accepted)
+                    for gt in truth_map.values()
+                ),
+            )
+            for dec, correct, n in conn.execute(SQL_DECISION_ACCURACY):
+                hits[dec] = [correct, n]
+    finally:
+        conn.close()
+
+    return EvalResult(
+        total_runs=total_runs,
+        by_decision=by_decision,
+        by_bucket=by_bucket,
+        auto_apply_accuracy=_ratio(*hits["APPLY"]),
+        auto_propose_accuracy=_ratio(*hits["PROPOSE"]),
+    )
+
+
 def evaluate_runs(
-    runs: List[RunRecord],
+    runs: Iterable[RunRecord],
     truth_map: Optional[Dict[Tuple[str, str, int], GroundTruth]] = None,
 ) -> EvalResult:
     by_decision: Dict[str, int] = {}
     by_bucket: Dict[str, int] = {}
 
-    total_runs = len(runs)
+    total_runs = 0
 
     # Accuracy metrics (only if we have labels)
     auto_apply_correct = 0
@@ -193,6 +296,7 @@ def evaluate_runs(
     auto_propose_total = 0
 
     for r in runs:
+        total_runs += 1
         by_decision[r.decision] = by_decision.get(r.decision, 0) + 1
 
         bucket = _bucket_for_conf(r.confidence)
@@ -237,28 +341,30 @@ def evaluate_runs(
 # -----------------------------
 
 def print_eval_report(result: EvalResult) -> None:
-    print("\n================ OFFLINE EVAL REPORT ================")
-    print(f"Total agent runs: {result.total_runs}")
-    print("\nBy decision:")
-    for dec, count in sorted(result.by_decision.items(), key=lambda kv: kv[0]):
-        print(f"  {dec:10s} → {count}")
-
-    print("\nConfidence buckets:")
-    for bucket, count in sorted(result.by_bucket.items()):
-        print(f"  {bucket:10s} → {count}")
-
-    print("\nAccuracy (if labels provided):")
+    # build the whole report, then hand it to stdout in one write
+    lines = [
+        "\n================ OFFLINE EVAL REPORT ================",
+        f"Total agent runs: {result.total_runs}",
+        "\nBy decision:",
+    ]
+    lines.extend(f"  {dec:10s} → {count}" for dec, count in sorted(result.by_decision.items()))
+
+    lines.append("\nConfidence buckets:")
+    lines.extend(f"  {bucket:10s} → {count}" for bucket, count in sorted(result.by_bucket.items()))
+
+    lines.append("\nAccuracy (if labels provided):")
     if result.auto_apply_accuracy is not None:
-        print(f"  APPLY decisions   → {result.auto_apply_accuracy * 100:.1f}% correct")
+        lines.append(f"  APPLY decisions   → {result.auto_apply_accuracy * 100:.1f}% correct")
     else:
-        print("  APPLY decisions   → n/a (no or zero ground-truth)")
+        lines.append("  APPLY decisions   → n/a (no or zero ground-truth)")
 
     if result.auto_propose_accuracy is not None:
-        print(f"  PROPOSE decisions → {result.auto_propose_accuracy * 100:.1f}% correct")
+        lines.append(f"  PROPOSE decisions → {result.auto_propose_accuracy * 100:.1f}% correct")
     else:
-        print("  PROPOSE decisions → n/a (no or zero ground-truth)")
+        lines.append("  PROPOSE decisions → n/a (no or zero ground-truth)")
 
-    print("=====================================================\n")
+    lines.append("=====================================================\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # -----------------------------
@@ -290,15 +396,13 @@ def main(argv: List[str] | None = None) -> None:
     if len(argv) == 2:
         labels_path = Path(argv[1]).expanduser().resolve()
 
-    print(f"📊 Loading runs from {db_path}")
-    runs = load_runs(db_path)
-
     truth_map = None
     if labels_path:
         print(f"📘 Loading ground-truth labels from {labels_path}")
         truth_map = load_ground_truth(labels_path)
 
-    result = evaluate_runs(runs, truth_map)
+    print(f"📊 Aggregating runs from {db_path}")
+    result = evaluate_db(db_path, truth_map)
     print_eval_report(result)
 
 
@@ -2,44 +2,52 @@
 
 import os
 import subprocess
+from pathlib import PurePosixPath
 
 def abs_path(repo_path, file_rel):
-    file_rel = file_rel.replace("\\", "/")
-    if file_rel.startswith(repo_path):
-        file_rel = file_rel.replace(repo_path, "").lstrip("/")
-    return os.path.join(repo_path, file_rel).replace("\\", "/")
+    root = PurePosixPath(repo_path.replace("\\", "/"))
+    rel = PurePosixPath(file_rel.replace("\\", "/"))
+    # strip the repo prefix only when it is a real leading path component
+    try:
+        rel = rel.relative_to(root)
+    except ValueError:
+        pass
+    return str(root / rel)
+
+
+def _git(repo_path, *args, check=True):
+    return subprocess.run(["git", "-C", repo_path, *args], check=check)
 
 
 def create_branch_and_commit(repo_path, file_rel, new_content, issue_number):
     abs_file = abs_path(repo_path, file_rel)
     branch_name = f"auto-fix-{issue_number}"
 
-    # does branch exist locally?
-    r = subprocess.run(
-        ["git", "-C", repo_path, "rev-parse", "--verify", branch_name],
-        capture_output=True,
-        text=True,
-    )
-    branch_exists = (r.returncode == 0)
+    # local branches only: a bare checkout would DWIM a new branch off
+    # origin/auto-fix-N, which must not be amended and force-pushed here
+    branch_exists = _git(
+        repo_path, "show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}",
+        check=False,
+    ).returncode == 0
 
     if branch_exists:
-        subprocess.run(["git", "-C", repo_path, "checkout", branch_name], check=True)
+        _git(repo_path, "checkout", "-q", branch_name)
     else:
-        subprocess.run(["git", "-C", repo_path, "checkout", "-b", branch_name], check=True)
+        _git(repo_path, "checkout", "-q", "-b", branch_name)
 
     os.makedirs(os.path.dirname(abs_file), exist_ok=True)
     with open(abs_file, "w", encoding="utf-8") as f:
         f.write(new_content)
 
     rel_file = os.path.relpath(abs_file, repo_path).replace("\\", "/")
-    subprocess.run(["git", "-C", repo_path, "add", rel_file], check=True)
+    _git(repo_path, "add", rel_file)
 
     if branch_exists:
-        subprocess.run(["git", "-C", repo_path, "commit", "--amend", "--no-edit"], check=True)
-        subprocess.run(["git", "-C", repo_path, "push", "--force", "origin", branch_name], check=True)
+        _git(repo_path, "commit", "-q", "--amend", "--no-edit")
+        _git(repo_path, "push", "--force", "origin", branch_name)
     else:
-        subprocess.run(["git", "-C", repo_path, "commit", "-m", f"Auto fix issue #{issue_number}"], check=True)
-        subprocess.run(["git", "-C", repo_path, "push", "-u", "origin", branch_name], check=True)
+        _git(repo_path, "commit", "-q", "-m", f"Auto fix issue #{issue_number}")
+        _git(repo_path, "push", "-u", "origin", branch_name)
 
     return branch_name
 
@@ -51,9 +59,9 @@ def commit_and_push_amend(repo_path, file_rel, new_content):
         f.write(new_content)
 
     rel_file = os.path.relpath(abs_file, repo_path).replace("\\", "/")
-    subprocess.run(["git", "-C", repo_path, "add", rel_file], check=True)
-    subprocess.run(["git", "-C", repo_path, "commit", "--amend", "--no-edit"], check=True)
-    subprocess.run(["git", "-C", repo_path, "push", "--force"], check=True)
+    _git(repo_path, "add", rel_file)
+    _git(repo_path, "commit", "-q", "--amend", "--no-edit")
+    _git(repo_path, "push", "--force")
 
 def get_branch_diff(repo_path: str, branch_name: str) -> str:
     # diff against base branch main
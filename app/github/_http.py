@@ -0,0 +1,106 @@
+# app/github/_http.py
+from __future__ import annotations
+
+import time
+from typing import Any, Mapping, Optional, Tuple
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.github._tokens import TokenPool
+from app.utils.ttl_cache import TTLCache
+from config import GITHUB_TOKENS
+
+# Shared keep-alive pool for every GitHub call (github/ and ci/ helpers): a
+# single fix touches the API a dozen times (PR, comments, reviews, merge,
+# CI polls), and a fresh requests.<verb>() per call paid a new TCP+TLS
+# handshake each time.
+# Throttling and gateway errors are retried; after that the last response is handed back
+# so callers keep their own status-code handling.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# (connect, read): a dead node fails in 3s rather than stalling a poll for 20
+TIMEOUT = (3, 10)
+
+ADAPTER = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=_RETRY)
+
+SESSION = requests.Session()
+SESSION.mount("https://", ADAPTER)
+SESSION.mount("http://", ADAPTER)
+
+# with several tokens configured, spread calls across them (see _tokens)
+if len(GITHUB_TOKENS) > 1:
+    SESSION.auth = TokenPool(GITHUB_TOKENS)
+
+
+# (url, params) -> (etag, parsed body). Short TTL: issue/PR lists move fast,
+# and this only has to absorb the steady-state polling.
+_etag_cache = TTLCache(60, maxsize=512)
+
+# (url, params) -> (fetched_at, parsed body) of the last 200, kept for the
+# longest stale window any caller asks for
+STALE_MAX_SECONDS = 300
+_last_good = TTLCache(STALE_MAX_SECONDS, maxsize=512)
+
+# GitHub answers these when it is throttling or degraded, not because the
+# request is wrong; a recent body beats failing the whole poll
+_UPSTREAM_ERRORS = frozenset((429, 500, 502, 503, 504))
+
+
+def conditional_get(
+    url: str,
+    *,
+    headers: Mapping[str, str],
+    params: Optional[dict] = None,
+    timeout=TIMEOUT,
+    stale_for: float = 0,
+) -> Tuple[Optional[requests.Response], Any]:
+    """
+    GET with If-None-Match. Returns (response, parsed JSON); on a 304 the JSON
+    is the body cached from the last 200 (304s don't count against the rate
+    limit). The JSON is None for any other status, left to the caller.
+
+    With `stale_for` > 0, a 429/5xx or a connection error falls back to the
+    last good body if it is at most that many seconds old (the response is
+    None when the request never completed).
+    """
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = _etag_cache.get(key)
+    if cached:
+        headers = {**headers, "If-None-Match": cached[0]}
+
+    def _stale():
+        good = _last_good.get(key) if stale_for > 0 else None
+        if good and time.monotonic() - good[0] <= stale_for:
+            return good[1]
+        return None
+
+    try:
+        res = SESSION.get(url, headers=headers, params=params, timeout=timeout)
+    except requests.RequestException:
+        stale = _stale()
+        if stale is None:
+            raise
+        return None, stale
+
+    if res.status_code == 304 and cached:
+        _last_good.set(key, (time.monotonic(), cached[1]))
+        return res, cached[1]
+    if res.status_code != 200:
+        return res, (_stale() if res.status_code in _UPSTREAM_ERRORS else None)
+
+    data = orjson.loads(res.content)
+    etag = res.headers.get("ETag")
+    if etag:
+        _etag_cache.set(key, (etag, data))
+    if stale_for > 0:
+        _last_good.set(key, (time.monotonic(), data))
+    return res, data
@@ -0,0 +1,72 @@
+# app/github/_tokens.py
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable
+
+from requests.auth import AuthBase
+
+
+class TokenPool(AuthBase):
+    """
+    Round-robins GitHub tokens across requests so the 5000/hr primary limit
+    applies per token. Each response's X-RateLimit-Remaining/-Reset is
+    recorded; a token that hits zero is parked until its reset time.
+
+    Mounted as session auth, it only rewrites an Authorization header that
+    already carries one of the pool's tokens; an explicit per-call token is
+    left alone.
+    """
+
+    def __init__(self, tokens: Iterable[str]) -> None:
+        self._tokens = list(dict.fromkeys(tokens))
+        if not self._tokens:
+            raise ValueError("TokenPool needs at least one token")
+        self._members = frozenset(self._tokens)
+        self._parked_until: Dict[str, float] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def pick(self) -> str:
+        with self._lock:
+            now = time.time()
+            n = len(self._tokens)
+            for i in range(n):
+                token = self._tokens[(self._next + i) % n]
+                if self._parked_until.get(token, 0.0) <= now:
+                    self._next = (self._next + i + 1) % n
+                    return token
+            # every token is exhausted: use the one that resets first
+            return min(self._tokens, key=lambda t: self._parked_until.get(t, 0.0))
+
+    def record(self, token: str, headers) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            parked = int(remaining) <= 0
+            reset_at = float(reset)
+        except ValueError:
+            return
+        with self._lock:
+            if parked:
+                self._parked_until[token] = reset_at
+            else:
+                self._parked_until.pop(token, None)
+
+    def __call__(self, r):
+        scheme, _, current = (r.headers.get("Authorization") or "").partition(" ")
+        if current not in self._members:
+            return r
+
+        token = self.pick()
+        r.headers["Authorization"] = f"{scheme} {token}"
+
+        def _on_response(resp, *args, **kwargs):
+            self.record(token, resp.headers)
+            return resp
+
+        r.register_hook("response", _on_response)
+        return r
@@ -1,17 +1,25 @@
+import hashlib
 import subprocess
+from types import MappingProxyType
 from app.github.pr_creator import merge_pr, create_pr
 from app.agents.patch_generator import generate_fixed_content
 from config import GITHUB_TOKEN, GITHUB_API
-import requests, os
+from app.github._http import SESSION, TIMEOUT
+from app.utils.ttl_cache import TTLCache
+import os
+
+# (file_path, content hash) -> fixed content from a recent /fix
+_fix_cache = TTLCache(300, maxsize=256)
+
+HEADERS = MappingProxyType({
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github+json",
+})
 
 
 def comment_reply(owner, repo, issue_number, body):
     url = f"{GITHUB_API}/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
-    requests.post(url, json={"body": body}, headers=headers)
+    SESSION.post(url, json={"body": body}, headers=HEADERS, timeout=TIMEOUT)
 
 
 def handle_command(command, owner, repo, pr, repo_path, file_path, content_old):
@@ -30,10 +38,11 @@ def handle_command(command, owner, repo, pr, repo_path, file_path, content_old):
         return
 
     if command == "/close":
-        requests.patch(
+        SESSION.patch(
             f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{pr_number}",
-            headers={"Authorization": f"token {GITHUB_TOKEN}"},
+            headers=HEADERS,
             json={"state": "closed"},
+            timeout=TIMEOUT,
         )
         comment_reply(owner, repo, pr_number, "🔒 Closed by ChatOps command.")
         return
@@ -44,12 +53,19 @@ def handle_command(command, owner, repo, pr, repo_path, file_path, content_old):
         return
 
     if command == "/fix":
-        new_content, *_ = generate_fixed_content(
-            issue={"title":"ChatOps refix","body":""},
-            file_content=content_old,
-            file_path=file_path,
-            store=None
-        )
+        # duplicate /fix clicks on unchanged content reuse the last fix instead
+        # of paying for another model call
+        key = (file_path, hashlib.blake2b(content_old.encode(), digest_size=16).hexdigest())
+        new_content = _fix_cache.get(key)
+        if new_content is None:
+            new_content, *_ = generate_fixed_content(
+                issue={"title":"ChatOps refix","body":""},
+                file_content=content_old,
+                file_path=file_path,
+                store=None
+            )
+            if new_content:
+                _fix_cache.set(key, new_content)
         if not new_content:
             comment_reply(owner, repo, pr_number, "⚠ No fix generated.")
             return
@@ -57,7 +73,7 @@ def handle_command(command, owner, repo, pr, repo_path, file_path, content_old):
         with open(os.path.join(repo_path, file_path),"w") as f:
             f.write(new_content)
 
-        subprocess.run(["git","-C",repo_path,"add",file_path])
-        subprocess.run(["git","-C",repo_path,"commit","-m","ChatOps fix"])
+        # file is already tracked: commit-with-pathspec stages it too, no separate `git add`
+        subprocess.run(["git","-C",repo_path,"commit","-m","ChatOps fix","--",file_path])
         subprocess.run(["git","-C",repo_path,"push"])
         comment_reply(owner, repo, pr_number, "🔧 Fix applied & pushed.")
@@ -1,14 +1,22 @@
 import requests
 
+from app.github._http import ADAPTER, TIMEOUT
+
+
 class GitHubClient:
     def __init__(self, token: str):
         self.headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.github+json",
         }
+        # own session so the auth headers ride along without a per-call kwarg
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", ADAPTER)
+        self.session.mount("http://", ADAPTER)
 
     def get(self, url):
-        return requests.get(url, headers=self.headers)
+        return self.session.get(url, timeout=TIMEOUT)
 
     def post(self, url, json):
-        return requests.post(url, headers=self.headers, json=json)
+        return self.session.post(url, json=json, timeout=TIMEOUT)
@@ -1,14 +1,34 @@
 from __future__ import annotations
 
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import orjson
+
+from app.github._http import SESSION, TIMEOUT, conditional_get
 from config import GITHUB_TOKEN, GITHUB_API
 
-HEADERS = {
+HEADERS = MappingProxyType({
     "Authorization": f"Bearer {GITHUB_TOKEN}",
     "Accept": "application/vnd.github+json",
     "X-GitHub-Api-Version": "2022-11-28",
     "User-Agent": "AutoTriage-PR-Agent",
-}
+})
+
+
+MAX_ISSUE_PAGES = 10
+PAGE_FETCH_WORKERS = 4
+
+
+def _last_page(res) -> Optional[int]:
+    # GitHub's Link header: <...&page=7>; rel="last"
+    last = res.links.get("last", {}).get("url")
+    if not last:
+        return None
+    page = parse_qs(urlparse(last).query).get("page")
+    return int(page[0]) if page else None
 
 
 def fetch_bug_issues(owner: str, repo: str, *, state="open", per_page=50):
@@ -18,30 +38,38 @@ def fetch_bug_issues(owner: str, repo: str, *, state="open", per_page=50):
         raise RuntimeError("Missing GITHUB_TOKEN")
 
     url = f"{GITHUB_API}/repos/{owner}/{repo}/issues"
-    params = {"state": state, "labels": "bug", "per_page": min(max(int(per_page), 1), 100), "page": 1}
+    base = {"state": state, "labels": "bug", "per_page": min(max(int(per_page), 1), 100)}
 
-    bugs = []
-    while True:
-        res = requests.get(url, headers=HEADERS, params=params, timeout=20)
-        if res.status_code != 200:
+    def fetch_page(page: int):
+        res, data = conditional_get(url, headers=HEADERS, params={**base, "page": page}, stale_for=60)
+        if data is None:
+            if res is None:
+                raise RuntimeError("GitHub API unreachable and no recent issue list cached")
             raise RuntimeError(f"GitHub API error {res.status_code}: {res.text}")
-
-        data = res.json()
         if not isinstance(data, list):
             raise RuntimeError(f"Unexpected GitHub API response: {data}")
+        return res, data
 
-        for item in data:
-            if "pull_request" in item:
-                continue
-            bugs.append(item)
+    res, data = fetch_page(1)
+    pages = [data]
 
-        if len(data) < params["per_page"]:
-            break
-        params["page"] += 1
-        if params["page"] > 10:
-            break
+    if len(data) >= base["per_page"]:
+        # res is None when page 1 is a stale fallback: no Link header to read
+        last = _last_page(res) if res is not None else None
+        if last:
+            # page count is known up front: fetch the rest side by side, in order
+            rest = range(2, min(last, MAX_ISSUE_PAGES) + 1)
+            with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as pool:
+                pages.extend(d for _, d in pool.map(fetch_page, rest))
+        else:
+            # no Link header (a cached 304 or stale body): walk pages until a short one
+            page = 1
+            while len(data) >= base["per_page"] and page < MAX_ISSUE_PAGES:
+                page += 1
+                _, data = fetch_page(page)
+                pages.append(data)
 
-    return bugs
+    return [item for data in pages for item in data if "pull_request" not in item]
 
 def fetch_single_issue(owner: str, repo: str, number: int, token: str | None = None) -> dict:
     """
@@ -59,6 +87,6 @@ def fetch_single_issue(owner: str, repo: str, number: int, token: str | None = N
         headers["Authorization"] = f"token {auth_token}"
 
     url = f"{GITHUB_API}/repos/{owner}/{repo}/issues/{number}"
-    resp = requests.get(url, headers=headers)
+    resp = SESSION.get(url, headers=headers, timeout=TIMEOUT)
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
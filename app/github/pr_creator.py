@@ -1,9 +1,23 @@
 # app/github/pr_creator.py
-import requests
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from types import MappingProxyType
+
 from config import GITHUB_TOKEN, GITHUB_API
+from app.github._http import SESSION, TIMEOUT
 from app.ci.merge_watcher import wait_for_ci_result
 from app.github.rollback import revert_commit,reopen_issue
 
+HEADERS = MappingProxyType({
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github+json",
+})
+
+MERGE_TITLE = "Auto-merged PR #{}"
+
+logger = logging.getLogger(__name__)
+
 # ---------------- Basic PR Creation ---------------- #
 
 # def create_pr(owner, repo, branch, issue, draft=False):
@@ -29,10 +43,6 @@ from app.github.rollback import revert_commit,reopen_issue
 #     return resp.json()  
 
 def create_pr(owner, repo, branch, issue, draft=False):
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
     title = f"Auto fix issue #{issue['number']}: {issue.get('title','')}"
     body = issue.get("body") or ""
     data = {
@@ -43,7 +53,7 @@ def create_pr(owner, repo, branch, issue, draft=False):
         "draft": draft,
     }
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
-    resp = requests.post(url, json=data, headers=headers)
+    resp = SESSION.post(url, json=data, headers=HEADERS, timeout=TIMEOUT)
     resp.raise_for_status()
     return resp.json()  # → {number, html_url, head …}
 
@@ -56,11 +66,7 @@ def post_pr_comment(owner, repo, pr_number: int, body: str):
     Normal PR message (summary / retry logs / status updates).
     """
     url = f"{GITHUB_API}/repos/{owner}/{repo}/issues/{pr_number}/comments"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
-    requests.post(url, json={"body": body}, headers=headers)
+    SESSION.post(url, json={"body": body}, headers=HEADERS, timeout=TIMEOUT)
 
 
 # ---------------- Inline Code Review (LLM+CI annotations) ---------------- #
@@ -77,10 +83,6 @@ def post_pr_review_inline(owner, repo, pr_number: int, comments: list[dict]):
         return
 
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
 
     payload = {
         "event": "COMMENT",
@@ -94,7 +96,7 @@ def post_pr_review_inline(owner, repo, pr_number: int, comments: list[dict]):
         ],
     }
 
-    requests.post(url, json=payload, headers=headers)
+    SESSION.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
 
 
 # ---------------- PR Review Summary (Phase-2 Review Mode) ---------------- #
@@ -110,10 +112,6 @@ def post_review_summary(owner, repo, pr_number: int, summary_md: str, approve=Fa
         🔹 Auto approve/deny PRs in future
     """
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
 
     event = "APPROVE" if approve else "REQUEST_CHANGES"
 
@@ -122,7 +120,7 @@ def post_review_summary(owner, repo, pr_number: int, summary_md: str, approve=Fa
         "event": event,  # COMMENT | APPROVE | REQUEST_CHANGES
     }
 
-    requests.post(url, json=payload, headers=headers)
+    SESSION.post(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
 
 
 # ---------------- PR Status Reporter for CI Self-Healing ---------------- #
@@ -160,29 +158,23 @@ def merge_pr(owner: str, repo: str, pr_number: int, method: str = "squash") -> d
         raise ValueError("method must be 'merge', 'squash', or 'rebase'")
 
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{pr_number}/merge"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json"
-    }
     payload = {
-        "commit_title": f"Auto-merged PR #{pr_number}",
+        "commit_title": MERGE_TITLE.format(pr_number),
         "merge_method": method
     }
 
-    r = requests.put(url, json=payload, headers=headers)
+    r = SESSION.put(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
 
     # GitHub returns 200 on success, 405/409 on failure
     if r.status_code == 200:
-        print(f"🔗 GitHub Merge OK → PR #{pr_number}")
+        logger.info("🔗 GitHub Merge OK → PR #%s", pr_number)
         return r.json()
 
     # Useful debugging cases
     if r.status_code in (405, 409):
-        print(
-            f"⚠ GitHub Merge blocked → Status {r.status_code}\n"
-            f"   Reason: {r.json().get('message')}"
-        )
-        return {"merged": False, "reason": r.json().get("message")}
+        reason = r.json().get("message")
+        logger.warning("GitHub Merge blocked → Status %s, reason: %s", r.status_code, reason)
+        return {"merged": False, "reason": reason}
 
     r.raise_for_status()
     return r.json()
@@ -193,24 +185,35 @@ def auto_merge_with_validation(owner,repo,pr,repo_path,issue_number,merge_confid
     
     # Merge only if safe confidence threshold
     if merge_confidence < AUTO_MERGE_CONF:
-        print("⚠ Confidence below auto-merge threshold — skipping auto-merge.")
+        logger.info("Confidence below auto-merge threshold — skipping auto-merge.")
         return
 
     number = pr["number"]
     sha = pr["head"]["sha"]
-    merged = merge_pr(owner,repo,number)
-
-    if not merged.get("merged"):
-        print("❌ Merge failed – manual review required.")
-        return
 
-    print(f"🟢 Auto-Merged PR #{number}, validating CI…")
-    status = wait_for_ci_result(owner,repo,sha)
+    # start polling CI on the head SHA while the merge request is in flight
+    # rather than only after it returns; a refused merge cancels the poll
+    stop = Event()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        ci = pool.submit(wait_for_ci_result, owner, repo, sha, stop=stop)
+        try:
+            merged = merge_pr(owner,repo,number)
+        except Exception:
+            stop.set()
+            raise
+
+        if not merged.get("merged"):
+            stop.set()
+            logger.warning("Merge failed – manual review required.")
+            return
+
+        logger.info("🟢 Auto-Merged PR #%s, validating CI…", number)
+        status = ci.result()
 
     if status == "success":
-        print("🏆 CI Passed — fix confirmed.")
+        logger.info("🏆 CI Passed — fix confirmed.")
     else:
-        print(f"❌ CI Failed [{status}] → Rolling back commit…")
+        logger.warning("CI Failed [%s] → Rolling back commit…", status)
         revert_commit(repo_path,sha)
 
         reopen_issue(
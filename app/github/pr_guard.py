@@ -1,31 +1,45 @@
 from __future__ import annotations
 
-import requests
+import re
+from types import MappingProxyType
+from typing import Dict
+
+from app.github._http import conditional_get
 from config import GITHUB_TOKEN, GITHUB_API
 
-HEADERS = {
+HEADERS = MappingProxyType({
     "Authorization": f"Bearer {GITHUB_TOKEN}",
     "Accept": "application/vnd.github+json",
     "X-GitHub-Api-Version": "2022-11-28",
     "User-Agent": "AutoTriage-PR-Agent",
-}
+})
 
 
-def pr_exists(owner: str, repo: str, issue_number: int) -> bool:
+FIXES_RE = re.compile(r"Fixes #(\d+)")
+
+
+def build_pr_index(owner: str, repo: str) -> Dict[int, dict]:
+    """
+    Map every issue referenced as `Fixes #N` in an open PR body to that PR.
+    Build it once per pass and look issues up in it. Every call revalidates
+    the listing (a 304 is cheap), so a PR opened a moment ago is never missed.
+    """
     if not GITHUB_TOKEN:
         raise RuntimeError("Missing GITHUB_TOKEN")
 
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
     params = {"state": "open", "per_page": 100}
 
-    res = requests.get(url, headers=HEADERS, params=params, timeout=20)
-    if res.status_code != 200:
+    res, prs = conditional_get(url, headers=HEADERS, params=params, stale_for=30)
+    if prs is None:
         raise RuntimeError(f"Failed to list PRs: {res.text}")
 
-    needle = f"Fixes #{issue_number}"
-    for pr in res.json():
-        body = pr.get("body") or ""
-        if needle in body:
-            return True
+    index: Dict[int, dict] = {}
+    for pr in prs:
+        for m in FIXES_RE.finditer(pr.get("body") or ""):
+            index.setdefault(int(m.group(1)), pr)
+    return index
+
 
-    return False
+def pr_exists(owner: str, repo: str, issue_number: int) -> bool:
+    return int(issue_number) in build_pr_index(owner, repo)
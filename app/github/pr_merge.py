@@ -1,11 +1,13 @@
 # app/github/pr_merge.py
-import requests
+from types import MappingProxyType
+
+from app.github._http import SESSION, TIMEOUT
 from config import GITHUB_TOKEN, GITHUB_API
 
-headers = {
+HEADERS = MappingProxyType({
     "Authorization": f"token {GITHUB_TOKEN}",
     "Accept": "application/vnd.github+json",
-}
+})
 
 
 def merge_pr(owner, repo, pr_number, message="Auto-merged by AI agent"):
@@ -14,7 +16,7 @@ def merge_pr(owner, repo, pr_number, message="Auto-merged by AI agent"):
         "commit_title": message,
         "merge_method": "squash"
     }
-    r = requests.put(url, json=payload, headers=headers)
+    r = SESSION.put(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
     r.raise_for_status()
     return r.json()
 
@@ -22,10 +24,10 @@ def merge_pr(owner, repo, pr_number, message="Auto-merged by AI agent"):
 def close_issue(owner, repo, issue_number):
     url = f"{GITHUB_API}/repos/{owner}/{repo}/issues/{issue_number}"
     payload = {"state": "closed"}
-    requests.patch(url, json=payload, headers=headers)
+    SESSION.patch(url, json=payload, headers=HEADERS, timeout=TIMEOUT)
 
 
 def delete_branch(owner, repo, branch):
     url = f"{GITHUB_API}/repos/{owner}/{repo}/git/refs/heads/{branch}"
-    r = requests.delete(url, headers=headers)
+    r = SESSION.delete(url, headers=HEADERS, timeout=TIMEOUT)
     return r.status_code == 204
@@ -1,13 +1,19 @@
 # app/github/review_feedback.py
 from __future__ import annotations
 
-import requests
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import List, Optional
 
 from config import GITHUB_TOKEN, GITHUB_API
+from app.github._http import conditional_get
 from app.storage.artifact_store import ArtifactStore
 
+HEADERS = MappingProxyType({
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github+json",
+})
+
 
 @dataclass
 class ReviewNote:
@@ -20,13 +26,10 @@ class ReviewNote:
 
 def fetch_pr_reviews(owner: str, repo: str, pr_number: int) -> List[ReviewNote]:
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github+json",
-    }
-    resp = requests.get(url, headers=headers)
-    resp.raise_for_status()
-    data = resp.json()
+    resp, data = conditional_get(url, headers=HEADERS, stale_for=60)
+    if data is None:
+        resp.raise_for_status()
+        data = []
 
     notes: List[ReviewNote] = []
     for r in data:
@@ -59,20 +62,26 @@ def sync_reviews_into_memory(
         print("📝 No review feedback found.")
         return
 
+    # Dedupe — avoids duplicate storage when main re-runs; one lookup for the
+    # whole batch instead of an exists-query per review
+    known = store.feedback_exists_many(owner, repo, pr_number, (r.body for r in reviews))
+    rows = []
     for r in reviews:
-        # Dedupe — avoids duplicate storage when main re-runs
-        if store.feedback_exists(owner, repo, pr_number, r.body):
+        if r.body in known:
             continue
-
-        store.store_feedback(
-            owner=owner,
-            repo=repo,
-            issue_number=issue_number,
-            pr_number=pr_number,
-            reviewer=r.reviewer,
-            state=r.state,
-            body=r.body,
-            submitted_at=r.submitted_at,
+        known.add(r.body)
+        rows.append(
+            dict(
+                owner=owner,
+                repo=repo,
+                issue_number=issue_number,
+                pr_number=pr_number,
+                reviewer=r.reviewer,
+                state=r.state,
+                body=r.body,
+                submitted_at=r.submitted_at,
+            )
         )
 
-    print(f"🧠 Stored {len(reviews)} review feedback items → memory OK")
+    stored = store.store_feedback_bulk(rows)
+    print(f"🧠 Stored {stored} review feedback items → memory OK")
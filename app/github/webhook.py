@@ -0,0 +1,144 @@
+# app/github/webhook.py
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+from config import GITHUB_WEBHOOK_SECRET, SQLITE_PATH
+from app.chatops.command import parse_command
+from app.storage.artifact_store import ArtifactStore
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/webhook", tags=["webhook"])
+
+# ChatOps verb -> agent job action (same keys the dashboard enqueues)
+CHATOPS_ACTIONS = {
+    "fix": "fix_bugs",
+    "retry": "fix_bugs",
+    "propose": "create_pr",
+}
+
+# parsed by app.chatops but with no agent job behind them
+UNSUPPORTED_VERBS = {
+    "analysis": "there is no analysis job type",
+}
+
+
+@lru_cache(maxsize=1)
+def _bootstrap_store(db_path: str) -> ArtifactStore:
+    store = ArtifactStore(db_path)
+    store.init_db()
+    return store
+
+
+def get_store() -> ArtifactStore:
+    return _bootstrap_store(SQLITE_PATH)
+
+
+def verify_signature(body: bytes, signature: str, secret: Optional[str] = None) -> bool:
+    secret = secret if secret is not None else GITHUB_WEBHOOK_SECRET
+    if not secret or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def _status_reply(store: ArtifactStore, owner: str, repo: str) -> str:
+    jobs = [j for j in store.get_jobs(limit=50) if j["owner"] == owner and j["repo"] == repo]
+    if not jobs:
+        return "No jobs yet."
+    return "\n".join(["Recent:"] + [f"- job #{j['id']} {j['action']} → {j['status']}" for j in jobs[:6]])
+
+
+def dispatch_issue_comment(store: ArtifactStore, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Turn an `issue_comment.created` payload into an agent job.
+    Returns the reply to post, or None when the comment is not a command.
+    """
+    if payload.get("action") != "created":
+        return None
+    # never answer our own replies
+    if (payload.get("sender") or {}).get("type") == "Bot":
+        return None
+
+    issue_number = int(payload["issue"]["number"])
+    cmd = parse_command((payload.get("comment") or {}).get("body") or "", default_issue=issue_number)
+    if not cmd:
+        return None
+
+    repository = payload["repository"]
+    owner, repo = repository["owner"]["login"], repository["name"]
+
+    if cmd.verb == "status":
+        return _status_reply(store, owner, repo)
+
+    action = CHATOPS_ACTIONS.get(cmd.verb)
+    if not action:
+        why = UNSUPPORTED_VERBS.get(cmd.verb, "unknown command")
+        return f"`/{cmd.verb}` is not supported ({why}). Use /fix, /retry, /propose or /status."
+
+    job_id = store.enqueue_agent_job(
+        session_id=None,
+        owner=owner,
+        repo=repo,
+        action=action,
+        prompt=f"Issue #{cmd.issue_number}: {cmd.raw}",
+    )
+    store.append_job_event(job_id, "WEBHOOK_ENQUEUED", f"{owner}/{repo}#{issue_number} :: /{cmd.verb}")
+    return f"Job #{job_id} queued ({action}) for #{cmd.issue_number}."
+
+
+def _post_reply(owner: str, repo: str, issue_number: int, reply: str) -> None:
+    # comment_actions drags in the LLM patch generator; only load it to reply
+    from app.github.comment_actions import comment_reply
+
+    try:
+        comment_reply(owner, repo, issue_number, reply)
+    except Exception:
+        logger.exception("ChatOps reply to %s/%s#%s failed", owner, repo, issue_number)
+
+
+@router.post("/github")
+async def github_webhook(
+    request: Request,
+    background: BackgroundTasks,
+    store: ArtifactStore = Depends(get_store),
+):
+    """
+    GitHub pushes issue comments here, so ChatOps reacts on delivery instead
+    of a loop polling every repo. The job row is written inline; the reply
+    comment goes out after the 200 so the delivery stays inside GitHub's 10s.
+    """
+    body = await request.body()
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256", "")):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    event = request.headers.get("X-GitHub-Event", "")
+    if event == "ping":
+        return {"ok": True}
+    if event != "issue_comment":
+        return {"ignored": event}
+
+    payload = orjson.loads(body)
+    # SQLite writes: keep them off the event loop
+    reply = await run_in_threadpool(dispatch_issue_comment, store, payload)
+    if reply is None:
+        return {"ignored": "no command"}
+
+    repository = payload["repository"]
+    background.add_task(
+        _post_reply,
+        repository["owner"]["login"],
+        repository["name"],
+        int(payload["issue"]["number"]),
+        reply,
+    )
+    return {"accepted": True}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import sys
 import os
 import subprocess
@@ -7,9 +8,11 @@ from typing import Optional, List, Tuple
 
 from config import GITHUB_TOKEN, SQLITE_PATH, MAX_CHANGED_LINES
 
+logger = logging.getLogger(__name__)
+
 # ---- GitHub interaction ----
 from app.github.issue_reader import fetch_bug_issues
-from app.github.pr_guard import pr_exists
+from app.github.pr_guard import build_pr_index
 from app.github.pr_creator import create_pr, merge_pr  # NOTE: merge_pr must exist
 
 # ---- Static analysis ----
@@ -49,11 +52,6 @@ from app.ci.retry_engine import classify_ci_outcome, should_retry_from_ci
 
 from app.tests.test_runner import run_tests, TestResult
 
-from threading import Thread
-from app.github.comment_watcher import watch_loop
-
-# ---- Review / memory integration ----
-from app.github.review_feedback import sync_reviews_into_memory  # make sure this exists
 from app.dashboard.jobs import router as jobs_router
 
 import os, subprocess
@@ -177,12 +175,6 @@ def continue_full_PR_flow(
         except Exception:
             pass
 
-        # 🧠 Ingest review comments into memory (best-effort)
-        try:
-            sync_reviews_into_memory(owner, repo, pr_number, issue_number, store)
-        except Exception:
-            pass
-
     # Auto-Merge Phase-4 gate
     _maybe_auto_merge(
         owner,
@@ -332,41 +324,41 @@ def _maybe_auto_merge(
     """
     # CI / logic-only runs: don't merge in DRY_RUN
     if DRY_RUN:
-        print("ℹ DRY_RUN enabled – auto-merge disabled.")
+        logger.info("DRY_RUN enabled – auto-merge disabled.")
         return
 
     if confidence < AUTO_MERGE_CONF:
-        print(
-            f"ℹ Auto-merge skipped: confidence={confidence:.2f} "
-            f"< threshold={AUTO_MERGE_CONF:.2f}"
+        logger.info(
+            "Auto-merge skipped: confidence=%.2f < threshold=%.2f",
+            confidence, AUTO_MERGE_CONF,
         )
         return
 
     if not safety_verified:
-        print("ℹ Auto-merge skipped: safety_verified=False")
+        logger.info("Auto-merge skipped: safety_verified=False")
         return
 
     if ci_evidence is not None and getattr(ci_evidence, "has_failure", False):
-        print("ℹ Auto-merge skipped: CI evidence still has failures.")
+        logger.info("Auto-merge skipped: CI evidence still has failures.")
         return
 
     if pr.get("draft"):
-        print("ℹ Auto-merge skipped: PR is draft.")
+        logger.info("Auto-merge skipped: PR is draft.")
         return
 
     pr_number = pr.get("number")
     if not pr_number:
-        print("ℹ Auto-merge skipped: missing PR number from API response.")
+        logger.info("Auto-merge skipped: missing PR number from API response.")
         return
 
     try:
         merged = merge_pr(owner, repo, pr_number)
         if merged.get("merged"):
-            print(f"✅ Auto-merged PR #{pr_number}")
+            logger.info("✅ Auto-merged PR #%s", pr_number)
         else:
-            print(f"⚠ Auto-merge API returned no 'merged' flag for PR #{pr_number}")
+            logger.warning("Auto-merge API returned no 'merged' flag for PR #%s", pr_number)
     except Exception as e:
-        print(f"⚠ Auto-merge failed for PR #{pr_number}: {e}")
+        logger.warning("Auto-merge failed for PR #%s: %s", pr_number, e)
 
 
 # ===============================================
@@ -406,8 +398,6 @@ def run() -> None:
     owner, repo = parse_repo()
     print(f"\n🚀 Running agent on {owner}/{repo}")
 
-    start_chatops(owner, repo)
-
     repo_path = prepare_repo(owner, repo)
 
     # Storage (SQLite)
@@ -420,6 +410,7 @@ def run() -> None:
 
     bugs = fetch_bug_issues(owner, repo)
     print(f"🐞 Issues fetched: {len(bugs)}")
+    open_prs = build_pr_index(owner, repo)
 
     for issue in bugs:
         issue_number = issue["number"]
@@ -427,7 +418,7 @@ def run() -> None:
         print(f"📄 {issue.get('title', '(no title)')}")
 
         # Guard: existing PR
-        if pr_exists(owner, repo, issue_number):
+        if issue_number in open_prs:
             print("⏭️ PR already exists – skipping.")
             # Log run for visibility
             try:
@@ -1072,11 +1063,6 @@ def run() -> None:
                 except Exception:
                     pass
 
-                try:
-                    sync_reviews_into_memory(owner, repo, pr_number, issue_number, store)
-                except Exception:
-                    pass
-
             _maybe_auto_merge(
                 owner,
                 repo,
@@ -1127,11 +1113,6 @@ def run() -> None:
             except Exception:
                 pass
 
-            try:
-                sync_reviews_into_memory(owner, repo, pr_number, issue_number, store)
-            except Exception:
-                pass
-
         _maybe_auto_merge(
             owner,
             repo,
@@ -1142,16 +1123,6 @@ def run() -> None:
         )
 
 
-# OPTIONAL:
-# Run CI bot + ChatOps watcher in parallel mode
-# python main.py repo & python chatops.py repo
-
-
-def start_chatops(owner, repo):
-    t = Thread(target=watch_loop, args=(owner, repo), daemon=True)
-    t.start()
-    print("🤖 ChatOps background loop started.")
-
 def run_agent_pipeline(owner, repo, action, prompt):
     repo_path = prepare_repo(owner, repo)      # you already have this in main.py
     return run_full_agent(repo_path, owner, repo, action, prompt)
@@ -1284,7 +1255,6 @@ from app.storage.artifact_store import ArtifactStore
 from config import SQLITE_PATH, PR_DRAFT_THRESHOLD, PR_FULL_THRESHOLD
 from app.agents.proposal_engine import generate_proposal
 from app.agents.patch_generator import apply_patches
-from app.git_ops import create_branch_and_commit, commit_and_push_amend
 from app.github.pr_creator import create_pr, merge_pr
 
 def run_full_agent(repo_path, owner, repo, action, prompt):
@@ -1360,4 +1330,5 @@ def run_full_agent(repo_path, owner, repo, action, prompt):
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     run()
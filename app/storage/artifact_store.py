@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
 import json
+import threading
 import time
 import datetime
+from contextlib import contextmanager
+from typing import Dict, Optional, Set
 from werkzeug.security import generate_password_hash, check_password_hash
 
 
@@ -11,15 +15,69 @@ def now() -> str:
     return datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
+# Idle connections kept per db_path, shared by every ArtifactStore in the
+# process so request handlers reuse warm connections (and page cache).
+# Busy connections aren't capped: if the pool is empty a new one is opened,
+# and on release anything beyond POOL_SIZE is closed.
+POOL_SIZE = 8
+_pools: Dict[str, "queue.LifoQueue[sqlite3.Connection]"] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_for(db_path: str) -> "queue.LifoQueue[sqlite3.Connection]":
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(db_path, queue.LifoQueue(maxsize=POOL_SIZE))
+    return pool
+
+
 class ArtifactStore:
     def __init__(self, db_path: str):
         self.db_path = db_path
 
-    def _connect(self):
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+        # once per connection: WAL lets dashboard readers run alongside the
+        # job writer, busy_timeout waits out the writer instead of failing
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
         conn.row_factory = sqlite3.Row
         return conn
 
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        return self._configure(conn)
+
+    @contextmanager
+    def _connect(self):
+        """
+        Borrow a pooled connection. Same contract as `with sqlite3.connect()`:
+        commit on success, roll back on error; the connection is then returned
+        to the pool rather than left open.
+        """
+        pool = _pool_for(self.db_path)
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    # api.py job helpers use the short name
+    _conn = _connect
+
     # ----------------- INIT + MIGRATION -----------------
 
     def init_db(self):
@@ -74,9 +132,39 @@ class ArtifactStore:
                     payload TEXT,
                     created_at TEXT
                 );
+
+                -- job_detail reads events by job in id order: range scan, no sort
+                CREATE INDEX IF NOT EXISTS idx_job_events_jobid_id ON job_events(job_id, id);
+
+                CREATE TABLE IF NOT EXISTS review_feedback(
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    owner TEXT,
+                    repo TEXT,
+                    issue_number INT,
+                    pr_number INT,
+                    reviewer TEXT,
+                    state TEXT,
+                    body TEXT,
+                    submitted_at TEXT,
+                    created_at TEXT
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_review_feedback_pr ON review_feedback(owner, repo, pr_number);
                 """
             )
 
+            # agent_runs is written by the CLI pipeline, not created here;
+            # index it when it exists (eval ordering + per-issue lookups)
+            if db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='agent_runs'"
+            ).fetchone():
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_agent_runs_created ON agent_runs(created_at DESC)"
+                )
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_agent_runs_issue ON agent_runs(owner, repo, issue_number)"
+                )
+
             # 🔒 FIX 1 — schema migration for old DBs
             cols = [
                 r["name"]
@@ -162,6 +250,16 @@ class ArtifactStore:
                 (sid,),
             )]
 
+    def get_session_repo(self, sid: int, repo_id: Optional[int]):
+        if repo_id is None:
+            return None
+        with self._connect() as db:
+            r = db.execute(
+                "SELECT * FROM session_repos WHERE id=? AND session_id=?",
+                (repo_id, sid),
+            ).fetchone()
+            return dict(r) if r else None
+
     # ----------------- JOBS -----------------
 
     def enqueue_agent_job(self, session_id, owner, repo, action, prompt) -> int:
@@ -217,6 +315,24 @@ class ArtifactStore:
                 (sid,),
             )]
 
+    def get_session_bundle(self, sid: int):
+        """
+        Session row, its repos and its jobs, read on one pooled connection
+        inside a single read transaction (consistent snapshot under WAL).
+        """
+        with self._connect() as db:
+            db.execute("BEGIN")
+            row = db.execute("SELECT * FROM sessions WHERE id=?", (sid,)).fetchone()
+            repos = [dict(r) for r in db.execute(
+                "SELECT * FROM session_repos WHERE session_id=?",
+                (sid,),
+            )]
+            jobs = [dict(r) for r in db.execute(
+                "SELECT * FROM agent_jobs WHERE session_id=? ORDER BY created_at DESC",
+                (sid,),
+            )]
+        return (dict(row) if row else None), repos, jobs
+
     def get_jobs(self, limit: int = 20):
         with self._connect() as db:
             return [dict(r) for r in db.execute(
@@ -241,6 +357,66 @@ class ArtifactStore:
                 (jid,),
             )]
 
+    # ----------------- REVIEW FEEDBACK -----------------
+
+    def feedback_exists_many(self, owner: str, repo: str, pr_number: int, bodies) -> Set[str]:
+        """Which of `bodies` are already stored for this PR (one query for the batch)."""
+        wanted = set(bodies)
+        if not wanted:
+            return set()
+        with self._connect() as db:
+            stored = {r[0] for r in db.execute(
+                "SELECT body FROM review_feedback WHERE owner=? AND repo=? AND pr_number=?",
+                (owner, repo, pr_number),
+            )}
+        return wanted & stored
+
+    def feedback_exists(self, owner: str, repo: str, pr_number: int, body: str) -> bool:
+        return bool(self.feedback_exists_many(owner, repo, pr_number, [body]))
+
+    def store_feedback_bulk(self, rows) -> int:
+        """
+        rows: dicts with owner, repo, issue_number, pr_number, reviewer,
+        state, body, submitted_at. Written in one transaction.
+        """
+        ts = now()
+        params = [
+            (
+                r["owner"], r["repo"], r["issue_number"], r["pr_number"],
+                r["reviewer"], r["state"], r["body"], r.get("submitted_at"), ts,
+            )
+            for r in rows
+        ]
+        if not params:
+            return 0
+        with self._connect() as db:
+            db.executemany(
+                """
+                INSERT INTO review_feedback
+                (owner,repo,issue_number,pr_number,reviewer,state,body,submitted_at,created_at)
+                VALUES(?,?,?,?,?,?,?,?,?)
+                """,
+                params,
+            )
+        return len(params)
+
+    def store_feedback(self, **row) -> None:
+        self.store_feedback_bulk([row])
+
+    # ----------------- REPO GRAPH -----------------
+
+    def list_all_callers(self, callee_name: str):
+        """Distinct caller files of callee_name across every indexed repo_root."""
+        with self._connect() as db:
+            try:
+                return [r[0] for r in db.execute(
+                    "SELECT DISTINCT caller_file FROM py_calls WHERE callee_name=?",
+                    (callee_name,),
+                )]
+            except sqlite3.OperationalError:
+                # py_calls only exists once a repo has been indexed
+                return []
+
     # ----------------- STATS -----------------
 
     def get_dashboard_stats(self):
@@ -2,7 +2,13 @@ import os
 from dotenv import load_dotenv
 load_dotenv()
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# optional comma-separated pool of extra tokens; GitHub calls rotate across
+# GITHUB_TOKEN plus these (see app/github/_tokens.py)
+_TOKEN_POOL = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()]
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN") or (_TOKEN_POOL[0] if _TOKEN_POOL else None)
+GITHUB_TOKENS = list(dict.fromkeys(([GITHUB_TOKEN] if GITHUB_TOKEN else []) + _TOKEN_POOL))
+# shared secret for X-Hub-Signature-256 on POST /webhook/github
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 BASE_BRANCH = os.getenv("BASE_BRANCH","main")
@@ -16,6 +22,12 @@ SQLITE_PATH = os.getenv(
 MAX_CHANGED_LINES = int(os.getenv("MAX_CHANGED_LINES","25"))
 GITHUB_API="https://api.github.com"
 
+# seconds to memoize slow-changing GitHub metadata (default branch, PR head sha)
+GITHUB_META_CACHE_TTL = int(os.getenv("GITHUB_META_CACHE_TTL", "300"))
+
+# re-check template files on every render (development only)
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "0") == "1"
+
 PR_DRAFT_THRESHOLD=0.10
 PR_FULL_THRESHOLD=0.55
 
@@ -21,3 +21,23 @@ def test_init_creates_graph_tables(tmp_path):
     assert 'proposals' in tables
 
     conn.close()
+
+
+def test_connections_are_pooled_and_rolled_back(tmp_path):
+    store = ArtifactStore(str(tmp_path / "pool.db"))
+    store.init_db()
+
+    with store._connect() as first:
+        pass
+    with store._connect() as second:
+        assert second is first
+
+    try:
+        with store._connect() as db:
+            db.execute("INSERT INTO users(username) VALUES('ghost')")
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    with store._connect() as db:
+        assert db.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
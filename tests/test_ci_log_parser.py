@@ -0,0 +1,17 @@
+from app.ci.test_failure_parser import TOP_N, parse_ci_logs
+
+
+def test_ranked_lists_are_capped_and_ordered_by_hits():
+    frames = [f'  File "src/mod{i}.py", line 1, in fn{i}' for i in range(15)]
+    # mod3 is hit most, then mod7; the rest once each
+    frames += ['  File "src/mod3.py", line 2, in fn3'] * 3 + ['  File "src/mod7.py", line 2, in fn7']
+    failed = [f"FAILED tests/test_m{i}.py::test_case" for i in range(15)]
+
+    ev = parse_ci_logs("\n".join(frames + failed))
+
+    assert len(ev.failing_files_ranked) == TOP_N == 10
+    assert ev.failing_files_ranked[:2] == ["src/mod3.py", "src/mod7.py"]
+    assert ev.failing_function == "fn3"
+    assert len(ev.failing_tests_ranked) == TOP_N
+    assert len(ev.failing_test_files_ranked) == TOP_N
+    assert ev.raw_frame_count == 19
@@ -0,0 +1,95 @@
+import time
+
+import requests
+
+from app.github import _http, issue_reader
+from app.github._tokens import TokenPool
+
+
+def _response(status=200, content=b"[]", headers=None):
+    res = requests.Response()
+    res.status_code = status
+    res._content = content
+    res.headers.update(headers or {})
+    return res
+
+
+def test_fetch_bug_issues_serves_stale_pages_when_github_is_down(monkeypatch):
+    monkeypatch.setattr(issue_reader, "GITHUB_TOKEN", "t")
+    pages = {1: b'[{"number": 1}, {"number": 2}]', 2: b'[{"number": 3}]'}
+
+    def up(url, headers=None, params=None, timeout=None):
+        return _response(content=pages[params["page"]])
+
+    def down(*args, **kwargs):
+        raise requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(_http.SESSION, "get", up)
+    live = issue_reader.fetch_bug_issues("acme", "stale-demo", per_page=2)
+    assert [i["number"] for i in live] == [1, 2, 3]
+
+    # page 1 comes back as (None, stale body): no Link header to follow
+    monkeypatch.setattr(_http.SESSION, "get", down)
+    stale = issue_reader.fetch_bug_issues("acme", "stale-demo", per_page=2)
+    assert stale == live
+
+
+def test_conditional_get_reuses_body_on_304(monkeypatch):
+    seen = []
+
+    def get(url, headers=None, params=None, timeout=None):
+        seen.append(headers.get("If-None-Match"))
+        if len(seen) == 1:
+            return _response(content=b'[{"id": 1}]', headers={"ETag": '"v1"'})
+        return _response(status=304, content=b"")
+
+    monkeypatch.setattr(_http.SESSION, "get", get)
+    url = "https://api.github.com/repos/acme/etag-demo/pulls"
+    _, first = _http.conditional_get(url, headers={})
+    _, second = _http.conditional_get(url, headers={})
+
+    assert seen == [None, '"v1"']
+    assert second == first == [{"id": 1}]
+
+
+def test_conditional_get_stale_fallback(monkeypatch):
+    url = "https://api.github.com/repos/acme/stale-http/issues"
+    monkeypatch.setattr(_http.SESSION, "get", lambda *a, **k: _response(content=b'[{"id": 2}]'))
+    _http.conditional_get(url, headers={}, stale_for=60)
+
+    monkeypatch.setattr(_http.SESSION, "get", lambda *a, **k: _response(status=503, content=b""))
+    res, data = _http.conditional_get(url, headers={}, stale_for=60)
+    assert res.status_code == 503 and data == [{"id": 2}]
+
+    # without a stale window the upstream error is left to the caller
+    _, data = _http.conditional_get(url, headers={})
+    assert data is None
+
+    def down(*args, **kwargs):
+        raise requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(_http.SESSION, "get", down)
+    assert _http.conditional_get(url, headers={}, stale_for=60) == (None, [{"id": 2}])
+    try:
+        _http.conditional_get(url, headers={})
+    except requests.ConnectionError:
+        pass
+    else:
+        raise AssertionError("connection error should propagate without stale_for")
+
+
+def _auth(pool, token):
+    req = requests.Request("GET", "https://api.github.com/", headers={"Authorization": f"Bearer {token}"})
+    return pool(req.prepare())
+
+
+def test_token_pool_rotates_and_parks_exhausted_tokens():
+    pool = TokenPool(["a", "b", "c"])
+    used = [_auth(pool, "a").headers["Authorization"] for _ in range(4)]
+    assert used == ["Bearer a", "Bearer b", "Bearer c", "Bearer a"]
+
+    pool.record("b", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 600)})
+    assert {pool.pick() for _ in range(4)} == {"a", "c"}
+
+    # a token from outside the pool is left untouched
+    assert _auth(pool, "other").headers["Authorization"] == "Bearer other"
@@ -0,0 +1,63 @@
+import hashlib
+import hmac
+import json
+
+from app.storage.artifact_store import ArtifactStore
+from app.github.webhook import dispatch_issue_comment, verify_signature
+
+SECRET = "s3cret"
+
+
+def _payload(body, number=7, sender_type="User"):
+    return {
+        "action": "created",
+        "issue": {"number": number},
+        "comment": {"body": body},
+        "sender": {"login": "dev", "type": sender_type},
+        "repository": {"name": "demo", "owner": {"login": "acme"}},
+    }
+
+
+def _sign(raw: bytes) -> str:
+    return "sha256=" + hmac.new(SECRET.encode(), raw, hashlib.sha256).hexdigest()
+
+
+def test_signed_issue_comment_enqueues_job(tmp_path):
+    store = ArtifactStore(str(tmp_path / "hook.db"))
+    store.init_db()
+
+    raw = json.dumps(_payload("/fix")).encode()
+    assert verify_signature(raw, _sign(raw), secret=SECRET)
+
+    reply = dispatch_issue_comment(store, json.loads(raw))
+    assert "queued" in reply
+
+    jobs = store.get_jobs()
+    assert len(jobs) == 1
+    assert jobs[0]["owner"] == "acme" and jobs[0]["repo"] == "demo"
+    assert jobs[0]["action"] == "fix_bugs"
+    assert jobs[0]["status"] == "QUEUED"
+    # bare /fix defaults to the issue it was posted on
+    assert jobs[0]["prompt"].startswith("Issue #7:")
+
+
+def test_bad_signature_and_bot_comments_are_rejected(tmp_path):
+    store = ArtifactStore(str(tmp_path / "hook.db"))
+    store.init_db()
+
+    raw = json.dumps(_payload("/fix")).encode()
+    assert not verify_signature(raw, "sha256=" + "0" * 64, secret=SECRET)
+    assert not verify_signature(raw, _sign(raw), secret="")
+
+    assert dispatch_issue_comment(store, _payload("/fix", sender_type="Bot")) is None
+    assert dispatch_issue_comment(store, _payload("looks good")) is None
+    assert store.get_jobs() == []
+
+
+def test_analysis_is_rejected_with_an_explicit_reply(tmp_path):
+    store = ArtifactStore(str(tmp_path / "hook.db"))
+    store.init_db()
+
+    reply = dispatch_issue_comment(store, _payload("/analysis"))
+    assert reply.startswith("`/analysis` is not supported")
+    assert store.get_jobs() == []